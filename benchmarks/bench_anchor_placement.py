@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Measure anchor-text placement on a synthetic contract: searching several
+anchor patterns with one shared TextIndex versus extracting the page text
+again for every pattern.
+
+Usage: python benchmarks/bench_anchor_placement.py --pages 500
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import fitz
+
+from placement import TextIndex, find_anchor_placements
+
+PATTERNS = [r"Signature\s*:", r"Signed by", r"Initials\s*:"]
+
+def make_contract_pdf(path, page_count):
+    """Text pages with a signature line at the bottom of every page."""
+    doc = fitz.open()
+    for i in range(page_count):
+        page = doc.new_page(width=612, height=792)
+        page.insert_text((72, 72), f"Agreement, page {i + 1}", fontsize=16)
+        for line in range(36):
+            page.insert_text((72, 110 + line * 15), "The parties agree to the terms set out below " * 2, fontsize=8)
+        page.insert_text((72, 700), "Signature: ________________________", fontsize=11)
+        page.insert_text((360, 700), "Initials: ______", fontsize=11)
+    doc.save(path)
+    doc.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark anchor-text placement")
+    parser.add_argument('--pages', type=int, default=500, help="Number of pages in the synthetic contract")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, "contract.pdf")
+        make_contract_pdf(pdf_path, args.pages)
+
+        with fitz.open(pdf_path) as doc:
+            start = time.perf_counter()
+            separate = []
+            for pattern in PATTERNS:
+                separate.extend(find_anchor_placements(doc, 150, 40, patterns=[pattern]))
+            separate_time = time.perf_counter() - start
+
+        with fitz.open(pdf_path) as doc:
+            start = time.perf_counter()
+            text_index = TextIndex(doc)
+            shared = []
+            for pattern in PATTERNS:
+                shared.extend(find_anchor_placements(doc, 150, 40, patterns=[pattern], text_index=text_index))
+            shared_time = time.perf_counter() - start
+
+        print(f"{len(shared)} placements for {len(PATTERNS)} patterns on {args.pages} pages")
+        print(f"Text extracted per pattern: {separate_time:8.3f} s")
+        print(f"Shared text index:          {shared_time:8.3f} s")
+        print(f"Same placements: {separate == shared}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark the stamping backends of PDFProcessor.add_signatures_to_pdf
+Generates synthetic PDFs and a signature, signs them with every backend and
+checks that the rendered pages are pixel-identical across backends and keep
+their original text. One PDF stores each page's content as an array of
+streams (as PyMuPDF writes it), the other as a single stream (as ReportLab,
+Word and LibreOffice write it).
+
+Usage: python benchmarks/bench_backends.py --pages 800
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import fitz
+from PIL import Image, ImageDraw, ImageChops
+
+from pdf_processor import PDFProcessor, BACKENDS
+
+def make_synthetic_pdf(path, page_count):
+    """Creates a text and vector page PDF with page_count Letter pages."""
+    doc = fitz.open()
+    for i in range(page_count):
+        page = doc.new_page(width=612, height=792)
+        page.insert_text((72, 72), f"Synthetic contract page {i + 1}", fontsize=18)
+        for line in range(40):
+            page.insert_text((72, 110 + line * 15), "Lorem ipsum dolor sit amet " * 3, fontsize=9)
+        page.draw_rect(fitz.Rect(72, 700, 300, 740), color=(0, 0, 0))
+    doc.save(path)
+    doc.close()
+
+def make_single_stream_pdf(path, page_count):
+    """Creates a text page PDF whose pages each have a single content stream, as ReportLab writes them."""
+    from reportlab.pdfgen import canvas
+    pdf = canvas.Canvas(path, pagesize=(612, 792))
+    for i in range(page_count):
+        pdf.setFont("Helvetica", 18)
+        pdf.drawString(72, 720, f"Single stream contract page {i + 1}")
+        pdf.setFont("Helvetica", 9)
+        for line in range(40):
+            pdf.drawString(72, 682 - line * 15, "Lorem ipsum dolor sit amet " * 3)
+        pdf.showPage()
+    pdf.save()
+
+def make_signature(path):
+    """Creates a transparent PNG signature with anti-aliased strokes."""
+    img = Image.new("RGBA", (600, 240), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.line((20, 200, 200, 40, 320, 180, 580, 30), fill=(10, 20, 120, 255), width=10, joint="curve")
+    draw.ellipse((250, 60, 380, 200), outline=(10, 20, 120, 200), width=6)
+    img.save(path)
+
+def page_text(pdf_path, page_num):
+    with fitz.open(pdf_path) as doc:
+        return doc[page_num].get_text()
+
+def render_page(pdf_path, page_num):
+    with fitz.open(pdf_path) as doc:
+        pix = doc[page_num].get_pixmap(dpi=100)
+        return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark signature stamping backends")
+    parser.add_argument('--pages', type=int, default=800, help="Number of pages in the synthetic PDF")
+    parser.add_argument('--every', type=int, default=1, help="Sign every N-th page")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sig_path = os.path.join(tmp_dir, "signature.png")
+        make_signature(sig_path)
+        signature_data = [
+            {'page_num': p, 'x': 80.0, 'y': 55.0, 'width': 150.0, 'height': 60.0}
+            for p in range(0, args.pages, args.every)
+        ]
+        # The first, middle and last signed pages
+        sample_pages = sorted({signature_data[0]['page_num'], signature_data[len(signature_data) // 2]['page_num'], signature_data[-1]['page_num']})
+        processor = PDFProcessor()
+
+        for label, make_pdf in (("array of content streams", make_synthetic_pdf), ("single content stream", make_single_stream_pdf)):
+            input_path = os.path.join(tmp_dir, "input.pdf")
+            make_pdf(input_path, args.pages)
+            outputs = {}
+            print(f"Signing {len(signature_data)} of {args.pages} pages, {label} per page")
+            for backend in BACKENDS:
+                output_path = os.path.join(tmp_dir, f"out_{backend}.pdf")
+                start = time.perf_counter()
+                processor.add_signatures_to_pdf(input_path, sig_path, output_path, signature_data, backend=backend)
+                elapsed = time.perf_counter() - start
+                size_kb = os.path.getsize(output_path) / 1024
+                print(f"{backend:>8}: {elapsed:8.3f} s  {size_kb:10.1f} KB")
+                outputs[backend] = output_path
+
+            # Signing must leave the page's own content in place
+            for backend in BACKENDS:
+                lost = [page_num for page_num in sample_pages if page_text(outputs[backend], page_num) != page_text(input_path, page_num)]
+                print(f"{backend} text: {'kept' if not lost else f'LOST on pages {lost}'}")
+
+            # Compare the sampled pages against the reference backend
+            reference = BACKENDS[0]
+            for backend in BACKENDS[1:]:
+                for page_num in sample_pages:
+                    diff = ImageChops.difference(render_page(outputs[reference], page_num), render_page(outputs[backend], page_num))
+                    max_delta = max(band_max for _, band_max in diff.getextrema())
+                    status = "identical" if max_delta == 0 else f"max pixel delta {max_delta}"
+                    print(f"{backend} vs {reference}, page {page_num}: {status}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Measure how often a batch job reads its input PDF: one job places signatures
+from a template, keys the output cache and writes the signed copy. Reports
+the bytes copied through read() calls (/proc/self/io rchar), the bytes
+fetched from storage (read_bytes) and the time per job, with the input
+evicted from the page cache first so every run starts cold.
+
+Linux only. Usage: python benchmarks/bench_input_reads.py --pages 200 1000 4000 --repeat 3
+"""
+
+import os
+import sys
+import io
+import time
+import argparse
+import statistics
+import contextlib
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bench_backends import make_synthetic_pdf, make_signature
+from batch import sign_batch
+
+TEMPLATE = '{"name": "bench", "placements": [{"pages": "last", "x": 0.12, "y": 0.08, "width": 0.25, "height": 0.06}]}'
+
+def io_counters():
+    with open("/proc/self/io") as f:
+        return {name: int(value) for name, value in (line.split(":") for line in f)}
+
+def evict(path):
+    """Drops the file from the page cache so the next read goes to storage."""
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+def run_job(job, output_cache_dir):
+    evict(job['input_pdf_path'])
+    before = io_counters()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result, = sign_batch([job], workers=1, output_cache_dir=output_cache_dir)
+    elapsed = time.perf_counter() - start
+    after = io_counters()
+    if result['error']:
+        raise RuntimeError(result['error'])
+    return after['rchar'] - before['rchar'], after['read_bytes'] - before['read_bytes'], elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark input reads per batch job")
+    parser.add_argument('--pages', type=int, nargs='+', default=[200, 1000, 4000], help="Input sizes in pages")
+    parser.add_argument('--repeat', type=int, default=3, help="Cold runs per size; the median time is reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sig_path = os.path.join(tmp_dir, "signature.png")
+        make_signature(sig_path)
+        template_path = os.path.join(tmp_dir, "template.json")
+        with open(template_path, "w") as f:
+            f.write(TEMPLATE)
+
+        print(f"{'Pages':>6} {'Input MB':>9} {'read() MB':>10} {'Storage MB':>11} {'Seconds':>8}")
+        for page_count in args.pages:
+            input_path = os.path.join(tmp_dir, f"in{page_count}.pdf")
+            make_synthetic_pdf(input_path, page_count)
+            job = {
+                'input_pdf_path': input_path,
+                'signature_path': sig_path,
+                'output_pdf_path': os.path.join(tmp_dir, "out", f"out{page_count}.pdf"),
+                'signature_data': [],
+                'template': template_path,
+            }
+            # A fresh cache directory per run: the job misses, so it hashes, places and writes
+            runs = [run_job(job, os.path.join(tmp_dir, f"cache{page_count}_{i}")) for i in range(args.repeat)]
+            read_calls, storage, _ = runs[-1]
+            elapsed = statistics.median(run[2] for run in runs)
+            input_mb = os.path.getsize(input_path) / 1e6
+            print(f"{page_count:>6} {input_mb:>9.1f} {read_calls / 1e6:>10.1f} {storage / 1e6:>11.1f} {elapsed:>8.2f}")
+
+if __name__ == "__main__":
+    main()
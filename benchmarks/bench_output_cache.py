@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Simulate re-running a batch that crashed part way: sign the first 90% of the
+documents with an output cache, then run the whole batch again and compare
+against a run without the cache.
+
+Usage: python benchmarks/bench_output_cache.py --documents 100 --pages 20
+"""
+
+import os
+import sys
+import io
+import time
+import argparse
+import contextlib
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bench_backends import make_synthetic_pdf, make_signature
+from batch import sign_batch
+
+def run_batch(jobs, output_cache_dir):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = sign_batch(jobs, workers=1, output_cache_dir=output_cache_dir)
+    elapsed = time.perf_counter() - start
+    errors = [r['error'] for r in results if r['error']]
+    if errors:
+        raise RuntimeError(errors[0])
+    return elapsed, sum(1 for r in results if r['cached'])
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark re-running a batch with the output cache")
+    parser.add_argument('--documents', type=int, default=100, help="Documents in the batch")
+    parser.add_argument('--pages', type=int, default=20, help="Pages per document")
+    parser.add_argument('--done', type=float, default=0.9, help="Fraction finished before the simulated crash")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sig_path = os.path.join(tmp_dir, "signature.png")
+        make_signature(sig_path)
+        template_path = os.path.join(tmp_dir, "template.pdf")
+        make_synthetic_pdf(template_path, args.pages)
+        with open(template_path, "rb") as f:
+            template_bytes = f.read()
+
+        jobs = []
+        for i in range(args.documents):
+            input_path = os.path.join(tmp_dir, "in", f"doc{i}.pdf")
+            os.makedirs(os.path.dirname(input_path), exist_ok=True)
+            # A distinct trailing comment per file gives every input its own content hash
+            with open(input_path, "wb") as f:
+                f.write(template_bytes + f"\n% document {i}\n".encode())
+            jobs.append({
+                'input_pdf_path': input_path,
+                'signature_path': sig_path,
+                'output_pdf_path': os.path.join(tmp_dir, "out", f"doc{i}.pdf"),
+                'signature_data': [{'page_num': args.pages - 1, 'x': 80.0, 'y': 55.0, 'width': 150.0, 'height': 60.0}],
+            })
+
+        cache_dir = os.path.join(tmp_dir, "output_cache")
+        done = int(len(jobs) * args.done)
+        first_time, _ = run_batch(jobs[:done], cache_dir)
+        uncached_time, _ = run_batch(jobs, None)
+        rerun_time, cached = run_batch(jobs, cache_dir)
+
+        for label, elapsed in ((f"First run, crashed after {done}/{len(jobs)}", first_time),
+                               ("Full re-run without cache", uncached_time),
+                               ("Full re-run with cache", rerun_time)):
+            print(f"{label:<34} {elapsed:8.2f} s")
+        print(f"Outputs reused from the cache: {cached}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Compare a batch whose jobs copy in, sign and copy out one after another
+with the pipeline (src/pipeline.py), which overlaps the copies with signing,
+on a simulated network share. The share is simulated by slowing down the
+pipeline's file copies: every file pays --latency-ms and all transfers share
+--share-mbps of bandwidth, as they would on one NFS mount.
+
+Also reported: the time the copies alone take through the share (the I/O
+bound the pipeline should approach) and the signing alone on local files.
+
+Usage: python benchmarks/bench_pipeline.py --documents 24 --pages 100 --share-mbps 40 --latency-ms 30
+"""
+
+import os
+import sys
+import io
+import time
+import argparse
+import tempfile
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bench_backends import make_synthetic_pdf, make_signature
+import batch
+import pipeline
+
+class SlowShare:
+    """Copies files as if over a network share: a fixed latency per file, one shared bandwidth."""
+
+    def __init__(self, mbps, latency):
+        self.bytes_per_second = mbps * 1024 * 1024
+        self.latency = latency
+        self._link = threading.Lock()
+        self._copy = pipeline._copy_file
+
+    def __call__(self, source_path, destination_path):
+        time.sleep(self.latency)
+        with self._link:
+            time.sleep(os.path.getsize(source_path) / self.bytes_per_second)
+        self._copy(source_path, destination_path)
+
+def run_serial(jobs, staging_dir, options):
+    """Each job copies in, signs and copies out before the next starts."""
+    batch._init_worker(sorted({job['signature_path'] for job in jobs}))
+    for index, job in enumerate(jobs):
+        staged = dict(job, input_pdf_path=os.path.join(staging_dir, f"in{index}.pdf"), output_pdf_path=os.path.join(staging_dir, f"out{index}.pdf"))
+        pipeline._stage_input(job['input_pdf_path'], staged['input_pdf_path'])
+        result = batch._sign_job(staged, options)
+        if result['error']:
+            raise RuntimeError(result['error'])
+        pipeline._publish_output(staged['output_pdf_path'], job['output_pdf_path'])
+
+def run_copies_only(jobs, staging_dir, concurrency):
+    """Copies every input in and a same-sized file out, without signing."""
+    def copy_job(item):
+        index, job = item
+        staged = os.path.join(staging_dir, f"copy{index}.pdf")
+        pipeline._stage_input(job['input_pdf_path'], staged)
+        pipeline._publish_output(staged, job['output_pdf_path'])
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(copy_job, enumerate(jobs)))
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function(*args, **kwargs)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the signing pipeline on a simulated network share")
+    parser.add_argument('--documents', type=int, default=24, help="Jobs in the batch")
+    parser.add_argument('--pages', type=int, default=100, help="Pages per document")
+    parser.add_argument('--share-mbps', type=float, default=40.0, help="Simulated share bandwidth in MB/s, shared by all transfers")
+    parser.add_argument('--latency-ms', type=float, default=30.0, help="Simulated latency per file copied")
+    parser.add_argument('--readers', type=int, default=pipeline.DEFAULT_READERS, help="Pipeline readers")
+    parser.add_argument('--writers', type=int, default=pipeline.DEFAULT_WRITERS, help="Pipeline writers")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Pipeline signing workers")
+    parser.add_argument('--backend', choices=("pypdf2", "pymupdf"), default="pypdf2")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        share_dir = os.path.join(tmp_dir, "share")
+        os.makedirs(share_dir)
+        sig_path = os.path.join(tmp_dir, "signature.png")
+        make_signature(sig_path)
+        input_path = os.path.join(share_dir, "in.pdf")
+        make_synthetic_pdf(input_path, args.pages)
+        jobs = []
+        for i in range(args.documents):
+            path = os.path.join(share_dir, f"in{i}.pdf")
+            os.link(input_path, path)
+            jobs.append({'input_pdf_path': path, 'signature_path': sig_path, 'output_pdf_path': os.path.join(share_dir, "out", f"out{i}.pdf"),
+                         'signature_data': [{'page_num': 0, 'x': 72.0, 'y': 72.0, 'width': 150.0, 'height': 60.0}]})
+        options = {'backend': args.backend, 'incremental': False, 'streaming': False, 'signature_dpi': None, 'signature_encoding': "flate"}
+
+        local_staging = os.path.join(tmp_dir, "local")
+        os.makedirs(local_staging)
+        signing_only = timed(run_serial, jobs, local_staging, options)
+
+        pipeline._copy_file = SlowShare(args.share_mbps, args.latency_ms / 1000)
+        copies_only = timed(run_copies_only, jobs, local_staging, max(args.readers, args.writers))
+        serial = timed(run_serial, jobs, local_staging, options)
+        pipelined = timed(pipeline.run_pipeline, jobs, readers=args.readers, workers=args.workers, writers=args.writers, **options)
+
+    print(f"{args.documents} documents of {args.pages} pages, {args.backend} backend, "
+          f"share {args.share_mbps:.0f} MB/s with {args.latency_ms:.0f} ms per file")
+    print(f"Signing only, local files:      {signing_only:7.2f} s")
+    print(f"Copies only, through the share: {copies_only:7.2f} s")
+    print(f"One job after another:          {serial:7.2f} s")
+    print(f"Pipeline ({args.readers} readers, {args.workers} workers, {args.writers} writers): {pipelined:7.2f} s")
+
+if __name__ == "__main__":
+    main()
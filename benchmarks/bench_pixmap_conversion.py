@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the per-page conversion from a rendered fitz.Pixmap to a
+displayable QPixmap: the old PPM -> PIL -> ImageQt path versus wrapping the
+pixmap's sample buffer directly in a QImage.
+
+Usage: python benchmarks/bench_pixmap_conversion.py --dpi 150 --repeat 20
+"""
+
+import os
+import sys
+import io
+import time
+import argparse
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import fitz
+from PIL import Image
+from PIL.ImageQt import ImageQt
+from PyQt6.QtGui import QGuiApplication, QPixmap
+
+from bench_backends import make_synthetic_pdf
+from pdf_processor import PDFProcessor
+from render_worker import pixmap_to_qimage
+
+def convert_via_ppm(pix):
+    """The previous path: PPM encode, PIL decode, RGBA convert, ImageQt, QPixmap."""
+    image = Image.open(io.BytesIO(pix.tobytes("ppm"))).convert("RGBA")
+    return QPixmap.fromImage(ImageQt(image))
+
+def convert_direct(pix):
+    return QPixmap.fromImage(pixmap_to_qimage(pix))
+
+def time_conversion(convert, pix, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        convert(pix)
+    return (time.perf_counter() - start) / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fitz.Pixmap to QPixmap conversion")
+    parser.add_argument('--dpi', type=int, default=150, help="Render resolution")
+    parser.add_argument('--repeat', type=int, default=20, help="Conversions per measurement")
+    args = parser.parse_args()
+
+    app = QGuiApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, "input.pdf")
+        make_synthetic_pdf(pdf_path, 1)
+        with fitz.open(pdf_path) as doc:
+            pix = PDFProcessor().render_pixmap(doc, 0, args.dpi)[0]
+
+            print(f"Page pixmap: {pix.width}x{pix.height} at {args.dpi} DPI")
+            before = time_conversion(convert_via_ppm, pix, args.repeat)
+            after = time_conversion(convert_direct, pix, args.repeat)
+            print(f"PPM + PIL + ImageQt: {before * 1000:8.2f} ms/page")
+            print(f"Direct QImage wrap:  {after * 1000:8.2f} ms/page")
+            print(f"Speedup:             {before / after:8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Compare signing one document per process (a CLI run per upload) with
+requests to a running signing service (src/service.py), and report how much
+of each service request is spent outside the signing itself.
+
+Usage: python benchmarks/bench_service.py --pages 20 --documents 30 --workers 4
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import statistics
+import subprocess
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(REPO_DIR, 'src'))
+
+from bench_backends import make_synthetic_pdf, make_signature
+import service
+
+PLACEMENTS = [{'page_num': 0, 'x': 72.0, 'y': 72.0, 'width': 150.0, 'height': 60.0}]
+
+def sign_with_cli(tmp_dir, pdf_path, sig_path, backend, index):
+    manifest_path = os.path.join(tmp_dir, f"job{index}.json")
+    with open(manifest_path, 'w') as f:
+        json.dump([{'input_pdf_path': pdf_path, 'signature_path': sig_path,
+                    'output_pdf_path': os.path.join(tmp_dir, f"cli{index}.pdf"), 'signature_data': PLACEMENTS}], f)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-m', 'src.cli', manifest_path, '--backend', backend], cwd=REPO_DIR, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+def sign_with_service(connection, body):
+    start = time.perf_counter()
+    connection.request('POST', '/sign', body, {'Content-Type': 'application/pdf', 'X-Signature-Data': json.dumps(PLACEMENTS)})
+    response = connection.getresponse()
+    signed = response.read()
+    elapsed = time.perf_counter() - start
+    if response.status != 200:
+        raise RuntimeError(signed.decode('utf-8', 'replace'))
+    return elapsed, float(response.getheader('X-Signing-Seconds'))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the signing service against one process per document")
+    parser.add_argument('--pages', type=int, default=20, help="Pages per document")
+    parser.add_argument('--documents', type=int, default=30, help="Documents signed per mode")
+    parser.add_argument('--workers', type=int, default=4, help="Service worker processes, and concurrent clients for the throughput run")
+    parser.add_argument('--backend', choices=("pypdf2", "pymupdf"), default="pymupdf")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, "in.pdf")
+        sig_path = os.path.join(tmp_dir, "signature.png")
+        make_synthetic_pdf(pdf_path, args.pages)
+        make_signature(sig_path)
+        with open(pdf_path, 'rb') as f:
+            body = f.read()
+
+        cli_runs = [sign_with_cli(tmp_dir, pdf_path, sig_path, args.backend, i) for i in range(min(args.documents, 10))]
+
+        start = time.perf_counter()
+        signing_service = service.SigningService({'signature': sig_path}, workers=args.workers, options={'backend': args.backend})
+        signing_service.start()
+        startup = time.perf_counter() - start
+        server = service.make_server(signing_service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            connection = http.client.HTTPConnection(service.HOST, server.server_port)
+            runs = [sign_with_service(connection, body) for _ in range(args.documents)]
+            connection.close()
+
+            def client(count):
+                connection = http.client.HTTPConnection(service.HOST, server.server_port)
+                for _ in range(count):
+                    sign_with_service(connection, body)
+                connection.close()
+            start = time.perf_counter()
+            with ThreadPoolExecutor(args.workers) as clients:
+                list(clients.map(client, [args.documents] * args.workers))
+            concurrent_elapsed = time.perf_counter() - start
+        finally:
+            server.shutdown()
+            server.server_close()
+            signing_service.stop()
+
+    latency = statistics.median(run[0] for run in runs)
+    overhead = statistics.median(run[0] - run[1] for run in runs)
+    print(f"{args.pages}-page document ({len(body) / 1024:.0f} KB), {args.backend} backend")
+    print(f"One CLI process per document:  {statistics.median(cli_runs) * 1000:8.1f} ms per document")
+    print(f"Service request:               {latency * 1000:8.1f} ms per document "
+          f"({overhead * 1000:.1f} ms outside signing; {args.workers} workers warmed in {startup:.2f} s)")
+    print(f"Service, {args.workers} concurrent clients: {args.workers * args.documents / concurrent_elapsed:8.1f} documents/s")
+
+if __name__ == "__main__":
+    main()
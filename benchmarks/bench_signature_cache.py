@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Measure what the signature cache saves when one signature is stamped on
+many small documents: a fresh PDFProcessor per document (decode and encode
+every time) versus one shared processor, and a cold processor that finds
+the encoded signature in an on-disk cache from a previous run.
+
+Usage: python benchmarks/bench_signature_cache.py --documents 200
+"""
+
+import os
+import sys
+import io
+import time
+import argparse
+import contextlib
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import Image, ImageDraw
+
+from bench_backends import make_synthetic_pdf
+from pdf_processor import PDFProcessor, BACKENDS
+
+def make_scanned_signature(path):
+    """A 2400x960 signature, about the size of a 600 DPI scan."""
+    img = Image.new("RGBA", (2400, 960), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.line((80, 800, 800, 160, 1280, 720, 2320, 120), fill=(10, 20, 120, 255), width=40, joint="curve")
+    draw.ellipse((1000, 240, 1520, 800), outline=(10, 20, 120, 200), width=24)
+    img.save(path)
+
+def sign_documents(make_processor, input_path, sig_path, output_path, signature_data, documents, backend):
+    start = time.perf_counter()
+    processor = None
+    # Silence the per-call timing line
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(documents):
+            processor = make_processor(processor)
+            processor.add_signatures_to_pdf(input_path, sig_path, output_path, signature_data, backend=backend)
+    return (time.perf_counter() - start) / documents
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the signature asset cache")
+    parser.add_argument('--documents', type=int, default=200, help="Documents signed per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = os.path.join(tmp_dir, "input.pdf")
+        sig_path = os.path.join(tmp_dir, "signature.png")
+        output_path = os.path.join(tmp_dir, "out", "output.pdf")
+        cache_dir = os.path.join(tmp_dir, "signature_cache")
+        make_synthetic_pdf(input_path, 1)
+        make_scanned_signature(sig_path)
+        signature_data = [{'page_num': 0, 'x': 80.0, 'y': 55.0, 'width': 150.0, 'height': 60.0}]
+
+        strategies = {
+            "uncached": lambda previous: PDFProcessor(),
+            "shared processor": lambda previous: previous or PDFProcessor(),
+            "cold, disk cache": lambda previous: PDFProcessor(signature_cache_dir=cache_dir),
+        }
+        for backend in BACKENDS:
+            # Populate the disk cache with this backend's encoded form before timing
+            sign_documents(lambda previous: PDFProcessor(signature_cache_dir=cache_dir), input_path, sig_path, output_path, signature_data, 1, backend)
+            for label, make_processor in strategies.items():
+                per_doc = sign_documents(make_processor, input_path, sig_path, output_path, signature_data, args.documents, backend)
+                print(f"{backend:>8} {label:>17}: {per_doc * 1000:8.2f} ms/document")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Measure output size and write time when a phone-photo sized signature is
+embedded at full resolution versus downsampled to a placement DPI, with
+Flate and with JPEG plus a separate alpha mask, for both backends.
+
+Usage: python benchmarks/bench_signature_dpi.py --pages 200 --dpi 300
+"""
+
+import os
+import sys
+import io
+import time
+import argparse
+import contextlib
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import fitz
+from PIL import Image, ImageDraw, ImageFilter, ImageChops
+
+from bench_backends import make_synthetic_pdf
+from pdf_processor import PDFProcessor, BACKENDS
+
+def make_photo_signature(path, size=(4000, 1500)):
+    """A photographed signature: noisy paper tones, soft ink strokes and a feathered alpha."""
+    width, height = size
+    paper = Image.effect_noise(size, 12).convert("RGB")
+    paper = ImageChops.multiply(paper, Image.new("RGB", size, (250, 246, 238)))
+    ink = Image.new("L", size, 0)
+    draw = ImageDraw.Draw(ink)
+    draw.line((width * 0.03, height * 0.8, width * 0.3, height * 0.15, width * 0.5, height * 0.7, width * 0.97, height * 0.1), fill=255, width=60, joint="curve")
+    draw.ellipse((width * 0.4, height * 0.2, width * 0.6, height * 0.85), outline=220, width=40)
+    ink = ink.filter(ImageFilter.GaussianBlur(6))
+    img = Image.composite(Image.new("RGB", size, (20, 30, 110)), paper, ink).convert("RGBA")
+    img.putalpha(ink)
+    img.save(path)
+
+def render_signature_area(pdf_path, page_num):
+    with fitz.open(pdf_path) as doc:
+        pix = doc[page_num].get_pixmap(dpi=150, clip=fitz.Rect(70, 660, 250, 750))
+        return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark signature downsampling and encoding")
+    parser.add_argument('--pages', type=int, default=200, help="Number of pages in the synthetic PDF")
+    parser.add_argument('--dpi', type=float, default=300, help="Target signature resolution")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = os.path.join(tmp_dir, "input.pdf")
+        sig_path = os.path.join(tmp_dir, "signature.png")
+        make_synthetic_pdf(input_path, args.pages)
+        make_photo_signature(sig_path)
+        signature_data = [
+            {'page_num': p, 'x': 80.0, 'y': 55.0, 'width': 150.0, 'height': 60.0}
+            for p in range(args.pages)
+        ]
+
+        print(f"Input: {args.pages} pages, {os.path.getsize(input_path) / 1024:.1f} KB")
+
+        variants = [
+            ("full resolution, flate", None, "flate"),
+            (f"{args.dpi:g} DPI, flate", args.dpi, "flate"),
+            (f"{args.dpi:g} DPI, jpeg", args.dpi, "jpeg"),
+        ]
+        for backend in BACKENDS:
+            reference = None
+            for label, dpi, encoding in variants:
+                output_path = os.path.join(tmp_dir, f"out_{backend}_{encoding}_{dpi}.pdf")
+                # A fresh processor each time, so every variant pays its own decode and encode
+                processor = PDFProcessor()
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    processor.add_signatures_to_pdf(input_path, sig_path, output_path, signature_data,
+                                                    backend=backend, signature_dpi=dpi, signature_encoding=encoding)
+                elapsed = time.perf_counter() - start
+                size_kb = os.path.getsize(output_path) / 1024
+
+                area = render_signature_area(output_path, 0)
+                if reference is None:
+                    reference = area
+                    quality = "reference"
+                else:
+                    diff = ImageChops.difference(reference, area).convert("L")
+                    mean_delta = sum(i * n for i, n in enumerate(diff.histogram())) / (diff.width * diff.height)
+                    quality = f"mean delta {mean_delta:.2f} at 150 DPI"
+                print(f"{backend:>8} {label:>24}: {elapsed:7.2f} s  {size_kb:9.1f} KB  {quality}")
+
+if __name__ == "__main__":
+    main()
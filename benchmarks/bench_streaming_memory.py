@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Compare peak Python memory of the pypdf2 backend with the output built in
+memory versus streamed to disk page by page, on a long synthetic PDF.
+Checks that sampled signed pages render identically in both outputs.
+
+Usage: python benchmarks/bench_streaming_memory.py --pages 5000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import ImageChops
+
+from bench_backends import make_synthetic_pdf, make_signature, render_page
+from pdf_processor import PDFProcessor
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark peak memory of streaming output")
+    parser.add_argument('--pages', type=int, default=5000, help="Number of pages in the synthetic PDF")
+    parser.add_argument('--every', type=int, default=10, help="Sign every N-th page")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = os.path.join(tmp_dir, "input.pdf")
+        sig_path = os.path.join(tmp_dir, "signature.png")
+        make_synthetic_pdf(input_path, args.pages)
+        make_signature(sig_path)
+        print(f"Input: {args.pages} pages, {os.path.getsize(input_path) / 1024 / 1024:.1f} MB")
+
+        signature_data = [
+            {'page_num': p, 'x': 80.0, 'y': 55.0, 'width': 150.0, 'height': 60.0}
+            for p in range(0, args.pages, args.every)
+        ]
+
+        processor = PDFProcessor()
+        outputs = {}
+        for streaming in (False, True):
+            label = "streaming" if streaming else "in-memory"
+            output_path = os.path.join(tmp_dir, f"out_{label}.pdf")
+            tracemalloc.start()
+            start = time.perf_counter()
+            processor.add_signatures_to_pdf(input_path, sig_path, output_path, signature_data, streaming=streaming)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            size_mb = os.path.getsize(output_path) / 1024 / 1024
+            print(f"{label:>9}: {elapsed:8.2f} s  peak {peak / 1024 / 1024:8.1f} MB  output {size_mb:6.1f} MB")
+            outputs[label] = output_path
+
+        sample_pages = sorted({signature_data[0]['page_num'], signature_data[len(signature_data) // 2]['page_num'], signature_data[-1]['page_num'], args.pages - 1})
+        for page_num in sample_pages:
+            diff = ImageChops.difference(render_page(outputs["in-memory"], page_num), render_page(outputs["streaming"], page_num))
+            max_delta = max(band_max for _, band_max in diff.getextrema())
+            status = "identical" if max_delta == 0 else f"max pixel delta {max_delta}"
+            print(f"streaming vs in-memory, page {page_num}: {status}")
+
+if __name__ == "__main__":
+    main()
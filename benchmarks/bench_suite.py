@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmark suite for the rendering and signing hot paths.
+
+Generates synthetic PDFs locally (text, vector-heavy or scanned-image pages,
+in several page sizes and lengths) and measures PDFProcessor.load_pdf,
+get_page_image and add_signatures_to_pdf (both backends) for latency,
+throughput, peak memory and output size. Every measurement runs in a fresh
+process, so its peak resident memory is its own and nothing is warm from an
+earlier one. Results are written as JSON that --compare checks against an
+earlier run, e.g. before and after upgrading PyPDF2 or PyMuPDF:
+
+    python benchmarks/bench_suite.py --output base.json
+    git checkout other-commit  # or pip install -U pymupdf
+    python benchmarks/bench_suite.py --output new.json --compare base.json
+
+--compare exits with status 1 when a time or peak memory grew by more than
+--threshold, so a nightly job can fail on a regression.
+
+Usage: python benchmarks/bench_suite.py [--quick] [--pages 50 500] [--kinds text vector scanned]
+       [--page-sizes letter a3] [--repeat 3] [--output results.json] [--compare base.json]
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+import contextlib
+import tempfile
+import multiprocessing
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.append(SRC_DIR)
+
+import fitz
+from PIL import Image, ImageDraw
+
+from bench_backends import make_signature
+
+PAGE_SIZES = {'letter': (612, 792), 'a4': (595, 842), 'a3': (842, 1191)}
+KINDS = ("text", "vector", "scanned")
+BENCHMARKS = ("load_pdf", "get_page_image", "sign_pypdf2", "sign_pymupdf")
+RENDERED_PAGES = 10  # get_page_image renders this many pages, uncached
+SIGN_EVERY = 10  # add_signatures_to_pdf stamps every N-th page
+SCAN_DPI = 100
+
+# Times and peak memory are compared; sizes and counts are reported only
+COMPARED_METRICS = ("seconds", "peak_rss_mb")
+
+def make_document(path, page_count, page_size="letter", kind="text", seed=0):
+    """Writes a deterministic synthetic PDF of page_count pages."""
+    width, height = PAGE_SIZES[page_size]
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for i in range(page_count):
+        page = doc.new_page(width=width, height=height)
+        if kind == "text":
+            page.insert_text((72, 72), f"Synthetic contract page {i + 1}", fontsize=18)
+            for line in range(int((height - 180) / 15)):
+                page.insert_text((72, 110 + line * 15), "Lorem ipsum dolor sit amet " * 3, fontsize=9)
+        elif kind == "vector":
+            # A drawing-like page: many short strokes and filled shapes in one content stream
+            shape = page.new_shape()
+            for _ in range(1500):
+                x, y = rng.uniform(36, width - 36), rng.uniform(36, height - 36)
+                shape.draw_line((x, y), (x + rng.uniform(-40, 40), y + rng.uniform(-40, 40)))
+            shape.finish(color=(0, 0, 0), width=0.4)
+            for _ in range(200):
+                x, y = rng.uniform(36, width - 72), rng.uniform(36, height - 72)
+                shape.draw_circle((x, y), rng.uniform(2, 20))
+            shape.finish(color=(0.1, 0.2, 0.6), fill=(0.8, 0.85, 1.0), width=0.3)
+            shape.commit()
+        elif kind == "scanned":
+            # A full-page grayscale JPEG per page, like the output of a document scanner
+            page.insert_image(page.rect, stream=_scan_image(width, height, i, rng))
+        else:
+            raise ValueError(f"Unknown document kind: {kind}")
+    doc.save(path, deflate=True)
+    doc.close()
+
+def _scan_image(width_pts, height_pts, page_index, rng):
+    size = (int(width_pts * SCAN_DPI / 72), int(height_pts * SCAN_DPI / 72))
+    img = Image.effect_noise(size, 24).point(lambda v: 200 + v // 5)
+    draw = ImageDraw.Draw(img)
+    for line in range(8, size[1] // 24):
+        draw.line((60, line * 24, size[0] - rng.randint(60, 400), line * 24), fill=60, width=3)
+    draw.text((60, 30), f"Scanned page {page_index + 1}", fill=0)
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=75)
+    return buffer.getvalue()
+
+def _peak_rss_mb():
+    import resource  # Unix only
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _measure(benchmark, pdf_path, sig_path, output_dir, repeat):
+    """Runs one benchmark in this (fresh) process and returns its metrics."""
+    from instrumentation import Instrumentation
+    from pdf_processor import PDFProcessor
+
+    records = []
+    processor = PDFProcessor(instrumentation=Instrumentation(callback=records.append, logger=None))
+    timings = []
+    if benchmark == "load_pdf":
+        # The first load in this process is part of the measurement
+        baseline_mb = _peak_rss_mb()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            page_count = processor.load_pdf(pdf_path)
+            timings.append(time.perf_counter() - start)
+        return {'pages': page_count, 'seconds': statistics.median(timings), 'pages_per_sec': page_count / statistics.median(timings),
+                'peak_rss_mb': max(0.0, _peak_rss_mb() - baseline_mb)}
+
+    page_count = processor.load_pdf(pdf_path)
+    baseline_mb = _peak_rss_mb()
+    metrics = {'pages': page_count}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            if benchmark == "get_page_image":
+                processor.page_cache.clear()
+                pages = list(range(min(RENDERED_PAGES, page_count)))
+                start = time.perf_counter()
+                for page_num in pages:
+                    processor.get_page_image(page_num, pdf_path)
+                timings.append(time.perf_counter() - start)
+                metrics['pages_per_sec'] = len(pages) / timings[-1]
+            else:
+                backend = benchmark.split("_", 1)[1]
+                signature_data = [
+                    {'page_num': p, 'x': 72.0, 'y': 72.0, 'width': 150.0, 'height': 60.0}
+                    for p in range(0, page_count, SIGN_EVERY)
+                ]
+                output_path = os.path.join(output_dir, f"{benchmark}.pdf")
+                start = time.perf_counter()
+                processor.add_signatures_to_pdf(pdf_path, sig_path, output_path, signature_data, backend=backend)
+                timings.append(time.perf_counter() - start)
+                metrics['pages_per_sec'] = page_count / timings[-1]
+                metrics['output_bytes'] = os.path.getsize(output_path)
+                metrics['stages'] = records[-1]['stages']
+    metrics['seconds'] = statistics.median(timings)
+    metrics['peak_rss_mb'] = max(0.0, _peak_rss_mb() - baseline_mb)
+    return metrics
+
+def run_suite(cases, benchmarks, repeat, work_dir, progress=print):
+    """Generates every case's document and measures each benchmark in its own process."""
+    sig_path = os.path.join(work_dir, "signature.png")
+    make_signature(sig_path)
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for kind, page_size, page_count in cases:
+        case = f"{kind}-{page_size}-{page_count}"
+        pdf_path = os.path.join(work_dir, f"{case}.pdf")
+        make_document(pdf_path, page_count, page_size, kind)
+        input_bytes = os.path.getsize(pdf_path)
+        for benchmark in benchmarks:
+            with context.Pool(1, maxtasksperchild=1) as pool:
+                metrics = pool.apply(_measure, (benchmark, pdf_path, sig_path, work_dir, repeat))
+            result = {'case': case, 'kind': kind, 'page_size': page_size, 'input_bytes': input_bytes, 'benchmark': benchmark}
+            result.update(metrics)
+            results.append(result)
+            progress(format_result(result))
+    return results
+
+def environment():
+    """Versions and machine details stored with the results, to explain differences between runs."""
+    import PyPDF2
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SRC_DIR, capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'pymupdf': fitz.VersionBind,
+        'pypdf2': PyPDF2.__version__,
+        'pillow': Image.__version__,
+    }
+
+def format_result(result):
+    line = f"{result['case']:<24} {result['benchmark']:<15} {result['seconds']:9.3f} s  peak {result['peak_rss_mb']:7.1f} MB"
+    if 'pages_per_sec' in result:
+        line += f"  {result['pages_per_sec']:8.1f} pages/s"
+    if 'output_bytes' in result:
+        line += f"  out {result['output_bytes'] / 1024 / 1024:7.2f} MB"
+    return line
+
+def compare(results, baseline, threshold):
+    """Prints the change of every compared metric against baseline results; returns the regressions."""
+    previous = {(r['case'], r['benchmark']): r for r in baseline['results']}
+    regressions = []
+    print(f"\nCompared with {baseline['environment'].get('commit') or 'baseline'} ({baseline['environment'].get('timestamp', '')}):")
+    for result in results:
+        before = previous.get((result['case'], result['benchmark']))
+        if before is None:
+            continue
+        changes = []
+        for metric in COMPARED_METRICS:
+            old, new = before.get(metric), result.get(metric)
+            # Sub-millisecond times and sub-megabyte memory are noise
+            floor = 0.001 if metric == "seconds" else 1.0
+            if old is None or new is None or max(old, new) < floor:
+                continue
+            ratio = new / max(old, floor)
+            changes.append(f"{metric} {ratio:5.2f}x")
+            if ratio > 1 + threshold:
+                regressions.append((result['case'], result['benchmark'], metric, old, new))
+        print(f"{result['case']:<24} {result['benchmark']:<15} " + "  ".join(changes))
+    for case, benchmark, metric, old, new in regressions:
+        print(f"REGRESSION {case} {benchmark}: {metric} {old:.3f} -> {new:.3f}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite for rendering and signing")
+    parser.add_argument('--quick', action='store_true', help="Small documents and one repeat, for a smoke run")
+    parser.add_argument('--pages', type=int, nargs='+', help="Document lengths (default 50 500)")
+    parser.add_argument('--kinds', nargs='+', choices=KINDS, default=list(KINDS), help="Page content kinds")
+    parser.add_argument('--page-sizes', nargs='+', choices=sorted(PAGE_SIZES), default=["letter"], help="Page sizes")
+    parser.add_argument('--benchmarks', nargs='+', choices=BENCHMARKS, default=list(BENCHMARKS), help="What to measure")
+    parser.add_argument('--repeat', type=int, help="Runs per measurement; the median time is reported (default 3)")
+    parser.add_argument('--output', metavar='FILE', help="Write the results as JSON")
+    parser.add_argument('--compare', metavar='FILE', help="Compare with an earlier --output file")
+    parser.add_argument('--threshold', type=float, default=0.15, help="Relative growth reported as a regression")
+    args = parser.parse_args()
+
+    pages = args.pages or ([10] if args.quick else [50, 500])
+    repeat = args.repeat or (1 if args.quick else 3)
+    cases = [(kind, page_size, page_count) for kind in args.kinds for page_size in args.page_sizes for page_count in pages]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        results = run_suite(cases, args.benchmarks, repeat, work_dir)
+
+    report = {'environment': environment(), 'settings': {'repeat': repeat, 'rendered_pages': RENDERED_PAGES, 'sign_every': SIGN_EVERY}, 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Check that signing keeps a page's own content when the page stores it as a
+single content stream, as ReportLab, Word and LibreOffice write pages: every
+signed page must keep its text and show the signature, with every backend
+and with the pypdf2 backend streaming its output, whose pages must also
+render exactly like the ones built in memory.
+
+Usage: python benchmarks/check_content_streams.py --pages 5
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import fitz
+from PIL import ImageChops
+
+from bench_backends import make_single_stream_pdf, make_signature, page_text, render_page
+from pdf_processor import PDFProcessor, BACKENDS
+
+def check(name, input_path, output_path, signature_data):
+    lost = [sig['page_num'] for sig in signature_data if page_text(output_path, sig['page_num']) != page_text(input_path, sig['page_num'])]
+    with fitz.open(output_path) as doc:
+        unsigned = [sig['page_num'] for sig in signature_data if not doc[sig['page_num']].get_images()]
+    ok = not lost and not unsigned
+    print(f"{name}: text lost on pages {lost}, signature missing on pages {unsigned}: {'ok' if ok else 'FAILED'}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that signing keeps single content stream pages intact")
+    parser.add_argument('--pages', type=int, default=5, help="Pages in the PDF")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = os.path.join(tmp_dir, "input.pdf")
+        sig_path = os.path.join(tmp_dir, "signature.png")
+        make_single_stream_pdf(input_path, args.pages)
+        make_signature(sig_path)
+        signature_data = [{'page_num': p, 'x': 80.0, 'y': 55.0, 'width': 150.0, 'height': 60.0} for p in range(0, args.pages, 2)]
+
+        ok = True
+        for backend in BACKENDS:
+            output_path = os.path.join(tmp_dir, f"out_{backend}.pdf")
+            PDFProcessor().add_signatures_to_pdf(input_path, sig_path, output_path, signature_data, backend=backend)
+            ok = check(backend, input_path, output_path, signature_data) and ok
+
+        streamed_path = os.path.join(tmp_dir, "out_streaming.pdf")
+        PDFProcessor().add_signatures_to_pdf(input_path, sig_path, streamed_path, signature_data, backend="pypdf2", streaming=True)
+        ok = check("pypdf2 streaming", input_path, streamed_path, signature_data) and ok
+        in_memory_path = os.path.join(tmp_dir, "out_pypdf2.pdf")
+        differing = [page_num for page_num in range(args.pages)
+                     if page_text(streamed_path, page_num) != page_text(in_memory_path, page_num)
+                     or ImageChops.difference(render_page(streamed_path, page_num), render_page(in_memory_path, page_num)).getbbox()]
+        print(f"pypdf2 streaming vs in memory: {'identical' if not differing else f'FAILED, pages {differing} differ'}")
+        ok = ok and not differing
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
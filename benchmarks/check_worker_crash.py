@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Check that a signing worker dying fails only the job it was running: one job
+in the batch kills its worker process outright, as a crash inside a native
+library would, and every other job must still be signed, by sign_batch and
+by the pipeline alike.
+
+Usage: python benchmarks/check_worker_crash.py --documents 12 --workers 2
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bench_backends import make_synthetic_pdf, make_signature
+import batch
+import pipeline
+
+class CrashWorker:
+    """Kills the worker process that unpickles the job holding it."""
+
+    def __reduce__(self):
+        return (os._exit, (1,))
+
+def make_jobs(tmp_dir, documents, crash_index):
+    sig_path = os.path.join(tmp_dir, "signature.png")
+    make_signature(sig_path)
+    input_path = os.path.join(tmp_dir, "in.pdf")
+    make_synthetic_pdf(input_path, 5)
+    jobs = []
+    for i in range(documents):
+        jobs.append({'input_pdf_path': input_path, 'signature_path': sig_path, 'output_pdf_path': os.path.join(tmp_dir, f"out{i}.pdf"),
+                     'signature_data': [{'page_num': 0, 'x': 72.0, 'y': 72.0, 'width': 150.0, 'height': 60.0}]})
+    jobs[crash_index]['crash'] = CrashWorker()
+    return jobs
+
+def check(name, results, jobs, crash_index, workers):
+    failed = [i for i, result in enumerate(results) if result['error']]
+    # Jobs running beside the crashing one may go down with it, no others
+    allowed = set(range(max(0, crash_index - workers + 1), crash_index + workers))
+    ok = crash_index in failed and set(failed) <= allowed and len(failed) <= workers
+    ok = ok and all(os.path.exists(job['output_pdf_path']) for i, job in enumerate(jobs) if i not in failed)
+    print(f"{name}: {len(jobs) - len(failed)} of {len(jobs)} signed, failed jobs {failed}: {'ok' if ok else 'FAILED'}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that a crashing signing worker fails only its own job")
+    parser.add_argument('--documents', type=int, default=12, help="Jobs in the batch")
+    parser.add_argument('--workers', type=int, default=2, help="Signing worker processes")
+    args = parser.parse_args()
+
+    crash_index = args.documents // 3
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        jobs = make_jobs(tmp_dir, args.documents, crash_index)
+        ok = check("sign_batch", batch.sign_batch(jobs, workers=args.workers), jobs, crash_index, args.workers)
+        for job in jobs:
+            if os.path.exists(job['output_pdf_path']):
+                os.remove(job['output_pdf_path'])
+        ok = check("pipeline", pipeline.run_pipeline(jobs, workers=args.workers), jobs, crash_index, args.workers) and ok
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -6,167 +6,95 @@ This script creates a spec file and builds the executable using PyInstaller for
 
 import os
 import sys
-import subprocess
+import time
 import shutil
+import statistics
+import subprocess
 from pathlib import Path
 
+APP_NAME = 'SignaturePDF'
+
+# Bundle files the app never loads, matched against their path inside the bundle.
+# Pages and signatures reach Qt as raw image buffers (no image format plugins),
+# nothing draws through OpenGL or uses the network, the UI is English only, and
+# the framebuffer, VNC and EGL platforms are for embedded devices.
+QT_EXCLUDED_PATHS = [
+    'PyQt6/Qt6/translations/',
+    'PyQt6/Qt6/plugins/imageformats/',
+    'PyQt6/Qt6/plugins/generic/',
+    'PyQt6/Qt6/plugins/tls/',
+    'PyQt6/Qt6/plugins/networkinformation/',
+    'PyQt6/Qt6/plugins/egldeviceintegrations/',
+    'PyQt6/Qt6/plugins/xcbglintegrations/',
+    'PyQt6/Qt6/plugins/wayland-graphics-integration-client/',
+    'PyQt6/Qt6/plugins/platforms/libqeglfs',
+    'PyQt6/Qt6/plugins/platforms/libqlinuxfb',
+    'PyQt6/Qt6/plugins/platforms/libqminimal',
+    'PyQt6/Qt6/plugins/platforms/libqvnc',
+    'PyQt6/Qt6/plugins/platforms/libqvkkhrdisplay',
+    'PyQt6/Qt6/plugins/platforms/qminimal',
+    'PyQt6/Qt6/plugins/platforms/qdirect2d',
+]
+# Qt libraries only the excluded plugins link against (file name prefixes, anywhere in the bundle)
+QT_EXCLUDED_LIBRARIES = [
+    'libQt6Pdf', 'libQt6Network', 'libQt6OpenGL', 'libQt6EglFSDeviceIntegration',
+    'Qt6Pdf', 'Qt6Network', 'Qt6OpenGL', 'opengl32sw', 'd3dcompiler',
+]
+# Modules the import analysis would otherwise pull in through optional imports
+EXCLUDED_MODULES = [
+    'tkinter', '_tkinter', 'PIL._tkinter_finder', 'PIL.ImageTk', 'PIL.ImageQt',
+    'PyQt6.QtNetwork', 'PyQt6.QtDBus', 'PyQt5', 'PySide2', 'PySide6',
+    'chardet',  # only ReportLab's XML parser tries it, and the app never parses XML with it
+    'numpy', 'scipy', 'pandas', 'matplotlib', 'IPython', 'jupyter',
+    'pytest', 'setuptools', 'wheel', 'pip', 'sqlite3', 'pyinstrument',
+]
+
 def create_spec_file():
-    """Create optimized spec file for the PDF Signature App"""
+    """Create the spec file: modules come from PyInstaller's import analysis of src/main.py, minus the unused parts above"""
     
-    spec_content = '''# -*- mode: python ; coding: utf-8 -*-
+    spec_content = f'''# -*- mode: python ; coding: utf-8 -*-
+# Generated by package.py; edit the lists there instead.
 
-block_cipher = None
+QT_EXCLUDED_PATHS = {QT_EXCLUDED_PATHS!r}
+QT_EXCLUDED_LIBRARIES = {QT_EXCLUDED_LIBRARIES!r}
 
-# Define the main script path
-script_path = 'src/main.py'  # Main entry point
+def is_used(entry):
+    dest = entry[0].replace('\\\\', '/')
+    if any(dest.startswith(path) for path in QT_EXCLUDED_PATHS):
+        return False
+    # Also drops the links to these libraries that PyInstaller places in the top level
+    return not dest.rsplit('/', 1)[-1].startswith(tuple(QT_EXCLUDED_LIBRARIES))
 
 a = Analysis(
-    [script_path],
-    pathex=['src'],  # Add src directory to path
+    ['src/main.py'],
+    pathex=['src'],  # The app modules import each other by name
     binaries=[],
-    datas=[('src', 'src')],  # Include the entire src directory
-    hiddenimports=[
-        'gui',  # Explicitly include package modules
-        'pdf_processor',
-        'utils',
-        # Tkinter and GUI
-        'PIL._tkinter_finder',
-        'tkinter',
-        'tkinter.filedialog',
-        'tkinter.messagebox',
-        'tkinter.ttk',
-        'tkinter.constants',
-        'tkinter.font',
-        
-        # PDF processing
-        'PyPDF2',
-        'PyPDF2._merger',
-        'PyPDF2._reader',
-        'PyPDF2._writer',
-        'PyPDF2.xmp',
-        'PyPDF2.generic',
-        'PyPDF2.utils',
-        'PyPDF2.pdf',
-        'PyPDF2.filters',
-        
-        # PyMuPDF
-        'fitz',
-        'fitz.fitz',
-        'fitz.utils',
-        
-        # ReportLab
-        'reportlab.pdfgen.canvas',
-        'reportlab.lib.utils',
-        'reportlab.lib.colors',
-        'reportlab.lib.units',
-        'reportlab.pdfbase',
-        'reportlab.pdfbase.pdfmetrics',
-        'reportlab.rl_config',
-        
-        # PIL/Pillow
-        'PIL.Image',
-        'PIL.ImageTk',
-        'PIL.ImageDraw',
-        'PIL.ImageFont',
-        'PIL.ImageOps',
-        'PIL._imaging',
-        
-        # Core Python modules needed
-        'io',
-        'pathlib',
-        'os',
-        'sys',
-        'time',
-        
-        # XML modules (required by PyPDF2)
-        'xml',
-        'xml.etree',
-        'xml.etree.ElementTree',
-        'xml.etree.cElementTree',
-        'xml.dom',
-        'xml.dom.minidom',
-        'xml.parsers',
-        'xml.parsers.expat',
-        
-        # Email modules (required by urllib/reportlab)
-        'email',
-        'email.mime',
-        'email.mime.base',
-        'email.mime.text',
-        'email.mime.multipart',
-        'email.encoders',
-        'email.utils',
-        
-        # HTTP/URL modules (required by reportlab)
-        'http',
-        'http.client',
-        'urllib',
-        'urllib.request',
-        'urllib.parse',
-        'urllib.error',
-        
-        # Other required modules
-        'base64',
-        'hashlib',
-        'struct',
-        'binascii',
-        'zlib',
-        'collections',
-        'itertools',
-        'functools',
-        'operator',
-        'weakref',
-        'copy',
-        'tempfile',
-        'shutil'
-    ],
+    datas=[],
+    # Everything imported by the app, lazy imports inside functions included, is
+    # found by the analysis; nothing is loaded by name at run time
+    hiddenimports=[],
     hookspath=[],
-    hooksconfig={},
+    hooksconfig={{}},
     runtime_hooks=[],
-    excludes=[
-        # Exclude only truly unnecessary modules
-        'matplotlib',
-        'numpy',
-        'scipy',
-        'pandas',
-        'jupyter',
-        'IPython',
-        'pytest',
-        'setuptools',
-        'wheel',
-        'pip',
-        'conda',
-        'tornado',
-        'zmq',
-        'sqlite3',
-        'requests',
-        'django',
-        'flask',
-        'fastapi',
-        'selenium',
-        'opencv',
-        'cv2',
-        'pdf2image'
-    ],
-    win_no_prefer_redirects=False,
-    win_private_assemblies=False,
-    cipher=block_cipher,
+    excludes={EXCLUDED_MODULES!r},
     noarchive=False,
 )
 
-# Remove duplicate entries
-pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
+a.binaries = [entry for entry in a.binaries if is_used(entry)]
+a.datas = [entry for entry in a.datas if is_used(entry)]
+
+pyz = PYZ(a.pure)
 
 exe = EXE(
     pyz,
     a.scripts,
     [],
     exclude_binaries=True,
-    name='SignaturePDF',
+    name='{APP_NAME}',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    upx=False,  # UPX-packed libraries are unpacked again on every launch
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -179,12 +107,10 @@ exe = EXE(
 coll = COLLECT(
     exe,
     a.binaries,
-    a.zipfiles,
     a.datas,
     strip=False,
-    upx=True,
-    upx_exclude=[],
-    name='SignaturePDF'
+    upx=False,
+    name='{APP_NAME}'
 )
 '''
     
@@ -207,7 +133,7 @@ def check_dependencies():
         print("✓ PyInstaller installed")
     
     # Check if main script and other modules exist
-    required_files = ['src/main.py', 'src/gui.py', 'src/pdf_processor.py', 'src/utils.py']
+    required_files = ['src/main.py', 'src/gui.py', 'src/pdf_processor.py', 'src/instrumentation.py', 'src/output_cache.py', 'src/page_cache.py', 'src/pdf_source.py', 'src/placement.py', 'src/render_worker.py', 'src/signature_cache.py', 'src/signing_worker.py', 'src/streaming_writer.py', 'src/templates.py', 'src/utils.py']
     missing_files = [f for f in required_files if not os.path.exists(f)]
     if missing_files:
         print(f"✗ Missing required files: {', '.join(missing_files)}")
@@ -250,12 +176,6 @@ def build_executable():
             print("✓ Build completed successfully!")
             print(f"Executable location: {os.path.abspath('dist/SignaturePDF')}")
             
-            # Check if executable was created
-            exe_path = Path('dist/SignaturePDF/SignaturePDF.exe')
-            if exe_path.exists():
-                size_mb = exe_path.stat().st_size / (1024 * 1024)
-                print(f"✓ Executable size: {size_mb:.2f} MB")
-            
             return True
         else:
             print("✗ Build failed!")
@@ -267,6 +187,60 @@ def build_executable():
         print(f"✗ Build error: {e}")
         return False
 
+def bundle_path():
+    return Path('dist') / APP_NAME
+
+def executable_path():
+    return bundle_path() / (APP_NAME + '.exe' if sys.platform == 'win32' else APP_NAME)
+
+def report_bundle_size():
+    """Print the size of the distributed folder and its largest parts"""
+    # PyInstaller links some libraries into the top level; count each file once
+    files = [path for path in bundle_path().rglob('*') if path.is_file() and not path.is_symlink()]
+    total_mb = sum(path.stat().st_size for path in files) / (1024 * 1024)
+    print(f"✓ Bundle size: {total_mb:.1f} MB in {len(files)} files")
+    
+    internal = bundle_path() / '_internal'
+    parts = {}
+    for path in files:
+        relative = path.relative_to(internal if internal in path.parents else bundle_path())
+        parts[relative.parts[0]] = parts.get(relative.parts[0], 0) + path.stat().st_size
+    for name, size in sorted(parts.items(), key=lambda item: -item[1])[:5]:
+        print(f"    {name:<24} {size / (1024 * 1024):7.1f} MB")
+
+def evict_bundle():
+    """Drop the bundle from the page cache so the next launch reads it from disk; returns False where that is unsupported"""
+    if not hasattr(os, 'posix_fadvise'):
+        return False
+    for path in bundle_path().rglob('*'):
+        if path.is_file():
+            with open(path, 'rb') as f:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    return True
+
+def report_startup_time(launches=5):
+    """Launch the built app with --profile-startup, which quits after the first paint, and print its wall time"""
+    env = dict(os.environ)
+    if sys.platform.startswith('linux') and not (env.get('DISPLAY') or env.get('WAYLAND_DISPLAY')):
+        env['QT_QPA_PLATFORM'] = 'offscreen'  # Headless build machine
+    
+    def launch(cold):
+        evicted = evict_bundle() if cold else False
+        start = time.perf_counter()
+        subprocess.run([str(executable_path()), '--profile-startup'], env=env, capture_output=True, timeout=120, check=True)
+        return time.perf_counter() - start, evicted
+    
+    try:
+        cold = [launch(cold=True) for _ in range(launches)]
+        warm = [launch(cold=False)[0] for _ in range(launches)]
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"✗ Could not measure the startup time: {e}")
+        return
+    
+    cold_label = "Cold start" if all(evicted for _, evicted in cold) else "First launch (bundle may be cached)"
+    print(f"✓ {cold_label}: {statistics.median(seconds for seconds, _ in cold):.2f} s, "
+          f"warm start: {statistics.median(warm):.2f} s (median of {launches} launches to the first painted window)")
+
 def create_launcher_script():
     """Create a simple launcher script for easier testing"""
     launcher_content = '''@echo off
@@ -310,7 +284,12 @@ def main():
     print()
     
     if success:
-        # Step 5: Create launcher
+        # Step 5: Report what the build costs to distribute and to launch
+        report_bundle_size()
+        report_startup_time()
+        print()
+        
+        # Step 6: Create launcher
         create_launcher_script()
         print()
         
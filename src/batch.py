@@ -0,0 +1,216 @@
+"""
+Parallel batch signing across a process pool.
+
+Every worker process owns its own PDFProcessor and prepares each distinct
+signature image once through its signature cache, so jobs only pay for
+parsing and writing their PDF. With a signature_cache_dir the encoded
+signatures are also shared between workers and across runs. Each input
+PDF is memory-mapped once per job (see pdf_source.PdfSource) and that one
+mapping serves placement, the output cache key and the writer. Each result
+carries the job's stage timings and counters (see instrumentation.py).
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from instrumentation import Instrumentation
+from pdf_processor import PDFProcessor
+from pdf_source import PdfSource
+from placement import TextIndex, find_anchor_placements
+from templates import load_template, template_placements
+
+# Per-process state, set up by _init_worker
+_worker_processor = None
+_worker_signatures = {}
+_worker_templates = {}
+_worker_records = []
+
+def _init_worker(signature_paths, signature_cache_dir=None, output_cache_dir=None, profiler=None, profile_dir=None):
+    global _worker_processor, _worker_signatures
+    instrumentation = Instrumentation(callback=_worker_records.append, profiler=profiler, profile_dir=profile_dir)
+    _worker_processor = PDFProcessor(signature_cache_dir=signature_cache_dir, output_cache_dir=output_cache_dir, instrumentation=instrumentation)
+    _worker_signatures = {}
+    for signature_path in signature_paths:
+        try:
+            _worker_signatures[signature_path] = _worker_processor.load_signature(signature_path)
+        except Exception as e:
+            # Keep the error so only the jobs using this signature fail
+            _worker_signatures[signature_path] = e
+
+def _failed_result(job, error):
+    return {'input_pdf_path': job['input_pdf_path'], 'output_pdf_path': job['output_pdf_path'], 'pages': 0, 'cached': False, 'seconds': 0.0, 'error': error,
+            'stages': {}, 'counters': {}}
+
+class WorkerPool:
+    """
+    Signing worker processes (set up by _init_worker) that outlive a worker dying.
+
+    A worker that dies, e.g. crashing inside a native library, breaks a
+    ProcessPoolExecutor for good and fails every job queued on it. Here only
+    the jobs running at that moment fail; the next submit() starts a new
+    executor. Keep at most `workers` jobs in flight so that only the job that
+    crashed and the ones running beside it are affected.
+    """
+
+    def __init__(self, workers, initargs, mp_context=None):
+        self.workers = workers
+        self._initargs = initargs
+        self._mp_context = mp_context
+        self._lock = threading.Lock()
+        self._executor = self._start()
+
+    def _start(self):
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=self._mp_context, initializer=_init_worker, initargs=self._initargs)
+
+    def _restart(self, broken):
+        # Several jobs may see the same executor break; only the first replaces it
+        with self._lock:
+            if self._executor is broken:
+                broken.shutdown(wait=False)
+                self._executor = self._start()
+            return self._executor
+
+    def submit(self, job, options):
+        """Signs job on a worker; the returned future always holds a result dict, never a worker failure."""
+        with self._lock:
+            executor = self._executor
+        try:
+            inner = executor.submit(_sign_job, job, options)
+        except BrokenProcessPool:
+            inner = self._restart(executor).submit(_sign_job, job, options)
+        future = Future()
+        def done(inner):
+            try:
+                future.set_result(inner.result())
+            except Exception as e:
+                future.set_result(_failed_result(job, f"Worker failed: {e}"))
+        inner.add_done_callback(done)
+        return future
+
+    def shutdown(self):
+        with self._lock:
+            self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+def _sign_job(job, options):
+    """Signs one job; options are keyword arguments for PDFProcessor.add_signature_image_to_pdf."""
+    start_time = time.perf_counter()
+    result = {'input_pdf_path': job['input_pdf_path'], 'output_pdf_path': job['output_pdf_path'], 'pages': 0, 'cached': False, 'error': None,
+              'stages': {}, 'counters': {}}
+    _worker_records.clear()
+    try:
+        signature = _worker_signatures.get(job['signature_path'])
+        if signature is None:
+            signature = _worker_processor.load_signature(job['signature_path'])
+            _worker_signatures[job['signature_path']] = signature
+        if isinstance(signature, Exception):
+            raise signature
+        signature_data = list(job['signature_data'])
+        template = None
+        if job.get('template'):
+            template = _worker_templates.get(job['template'])
+            if template is None:
+                template = _worker_templates[job['template']] = load_template(job['template'])
+        # Map the input once: placement, the output cache key and the writer all read the same pages
+        with PdfSource(job['input_pdf_path']) as source:
+            if template or job.get('anchors'):
+                with source.open_fitz() as doc:
+                    text_index = TextIndex(doc)
+                    if template:
+                        signature_data.extend(template_placements(doc, template, text_index))
+                    for spec in job.get('anchors', []):
+                        signature_data.extend(find_anchor_placements(doc, text_index=text_index, **spec))
+            if not signature_data and (template or job.get('anchors')):
+                raise ValueError("No signature placements (no anchor text found or the template selects no pages).")
+            result['pages'] = _worker_processor.add_signature_image_to_pdf(
+                source,
+                signature,
+                job['output_pdf_path'],
+                signature_data,
+                **options
+            )
+    except Exception as e:
+        result['error'] = str(e)
+    for record in _worker_records:
+        result['stages'] = record['stages']
+        result['counters'] = record['counters']
+        result['cached'] = bool(record['counters'].get('output_cache_hits'))
+        if 'profile' in record:
+            result['profile'] = record['profile']
+    result['seconds'] = time.perf_counter() - start_time
+    return result
+
+def sign_batch(jobs, workers=None, backend="pypdf2", incremental=False, on_result=None, streaming=False, signature_cache_dir=None,
+               signature_dpi=None, signature_encoding="flate", output_cache_dir=None, profiler=None, profile_dir=None):
+    """
+    Signs independent jobs (dicts as returned by utils.load_manifest) and
+    returns one result dict per job, in job order, with keys
+    'input_pdf_path', 'output_pdf_path', 'pages', 'cached', 'seconds', 'error',
+    'stages' (seconds per signing stage) and 'counters'.
+    A failing job only sets its own 'error'; the rest of the batch continues.
+
+    workers: number of processes (defaults to os.cpu_count()); 1 runs in-process.
+    on_result: optional callable invoked with each result, in job order.
+    streaming: write each output page by page (pypdf2 backend), see PDFProcessor.add_signatures_to_pdf.
+    signature_cache_dir: optional directory where encoded signatures are persisted and reused.
+    signature_dpi, signature_encoding: see PDFProcessor.add_signatures_to_pdf.
+    output_cache_dir: optional directory of earlier outputs; jobs identical to an earlier
+        one reuse its output, so re-running an interrupted batch only signs what is left.
+    profiler, profile_dir: profile every job, see instrumentation.Instrumentation; the
+        report (or the saved profile's path) is in the result's 'profile'.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+
+    if profiler:
+        # Reject an unknown or missing profiler here rather than in every worker
+        Instrumentation(profiler=profiler)
+
+    signature_paths = sorted({job['signature_path'] for job in jobs})
+    options = {
+        'backend': backend,
+        'incremental': incremental,
+        'streaming': streaming,
+        'signature_dpi': signature_dpi,
+        'signature_encoding': signature_encoding,
+    }
+    results = []
+
+    if workers == 1 or len(jobs) <= 1:
+        _init_worker(signature_paths, signature_cache_dir, output_cache_dir, profiler, profile_dir)
+        for job in jobs:
+            result = _sign_job(job, options)
+            results.append(result)
+            if on_result:
+                on_result(result)
+        return results
+
+    with WorkerPool(workers, (signature_paths, signature_cache_dir, output_cache_dir, profiler, profile_dir)) as pool:
+        finished = {}
+        running = {}
+        next_index = 0
+        while len(results) < len(jobs):
+            # Only as many jobs in flight as workers: a crash then fails just the jobs that were running
+            while next_index < len(jobs) and len(running) < workers:
+                running[pool.submit(jobs[next_index], options)] = next_index
+                next_index += 1
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                finished[running.pop(future)] = future.result()
+            # Report in job order
+            while len(results) in finished:
+                result = finished.pop(len(results))
+                results.append(result)
+                if on_result:
+                    on_result(result)
+    return results
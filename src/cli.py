@@ -0,0 +1,114 @@
+"""
+Headless batch signing from a manifest, without PyQt6.
+
+Usage: python -m src.cli manifest.json [--backend pymupdf] [--incremental] [--streaming] [--workers N] [--signature-cache DIR]
+       [--signature-dpi 300] [--signature-encoding jpeg] [--output-cache DIR]
+       [--metrics FILE] [--profile cprofile|pyinstrument] [--profile-dir DIR]
+       [--pipeline [--readers N] [--writers N] [--queue-size N] [--staging-dir DIR]]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+# Allow both `python -m src.cli` and `python src/cli.py` to find the sibling modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pdf_processor import BACKENDS
+from instrumentation import PROFILERS
+from signature_cache import SIGNATURE_ENCODINGS
+from batch import sign_batch
+from pipeline import run_pipeline, DEFAULT_READERS, DEFAULT_WRITERS
+from utils import load_manifest
+
+def print_result(result):
+    if result['error']:
+        print(f"✗ {result['input_pdf_path']}: {result['error']} ({result['seconds']:.2f} s)")
+    else:
+        cached = ", cached" if result.get('cached') else ""
+        print(f"✓ {result['input_pdf_path']} -> {result['output_pdf_path']} ({result['pages']} pages{cached}, {result['seconds']:.2f} s)")
+
+def print_summary(results, elapsed):
+    succeeded = [r for r in results if not r['error']]
+    pages = sum(r['pages'] for r in succeeded)
+    docs_per_sec = len(succeeded) / elapsed if elapsed > 0 else 0.0
+    pages_per_sec = pages / elapsed if elapsed > 0 else 0.0
+    print()
+    cached = sum(1 for r in succeeded if r.get('cached'))
+    print(f"Processed {len(succeeded)}/{len(results)} documents ({pages} pages, {cached} from cache) in {elapsed:.2f} s")
+    print(f"Throughput: {docs_per_sec:.2f} documents/sec, {pages_per_sec:.1f} pages/sec")
+    stages = {}
+    for result in succeeded:
+        for stage, seconds in result.get('stages', {}).items():
+            stages[stage] = stages.get(stage, 0.0) + seconds
+    if stages:
+        print("Time per stage: " + ", ".join(f"{stage} {seconds:.2f} s" for stage, seconds in stages.items()))
+
+def write_metrics(results, metrics_path):
+    """Writes one JSON line per job result, stage timings and counters included."""
+    with open(metrics_path, 'w', encoding='utf-8') as f:
+        for result in results:
+            f.write(json.dumps(result) + "\n")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sign PDFs listed in a JSON or CSV manifest.")
+    parser.add_argument('manifest', help="Path to a .json or .csv manifest")
+    parser.add_argument('--backend', choices=BACKENDS, default="pypdf2", help="Stamping backend")
+    parser.add_argument('--incremental', action='store_true', help="Append signatures as an incremental update (pymupdf only)")
+    parser.add_argument('--streaming', action='store_true', help="Write each output page by page to keep memory flat (pypdf2 only)")
+    parser.add_argument('--workers', type=int, default=1, help="Number of worker processes (0 = one per CPU core)")
+    parser.add_argument('--signature-cache', metavar='DIR', help="Persist prepared signature images here and reuse them across runs")
+    parser.add_argument('--signature-dpi', type=float, help="Downsample signatures to this resolution at their placed size")
+    parser.add_argument('--signature-encoding', choices=SIGNATURE_ENCODINGS, default="flate", help="How the signature image is compressed")
+    parser.add_argument('--output-cache', metavar='DIR', help="Reuse outputs of identical earlier jobs stored here, and store new ones")
+    parser.add_argument('--metrics', metavar='FILE', help="Write each job's result with stage timings and counters as JSON lines")
+    parser.add_argument('--profile', choices=PROFILERS, help="Profile every job (pyinstrument must be installed separately)")
+    parser.add_argument('--profile-dir', metavar='DIR', help="Save one profile file per job here instead of adding the report to --metrics")
+    parser.add_argument('--pipeline', action='store_true', help="Copy inputs in and outputs out while other jobs are signed (for network shares)")
+    parser.add_argument('--readers', type=int, default=DEFAULT_READERS, help="With --pipeline: inputs copied at once")
+    parser.add_argument('--writers', type=int, default=DEFAULT_WRITERS, help="With --pipeline: outputs copied at once")
+    parser.add_argument('--queue-size', type=int, help="With --pipeline: jobs waiting between stages (default: --workers)")
+    parser.add_argument('--staging-dir', metavar='DIR', help="With --pipeline: local folder for the copies being signed")
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = load_manifest(args.manifest)
+    except ValueError as e:
+        print(f"✗ {e}")
+        return 2
+
+    start_time = time.perf_counter()
+    if args.pipeline:
+        sign, pipeline_options = run_pipeline, {
+            'readers': args.readers, 'writers': args.writers, 'queue_size': args.queue_size, 'staging_dir': args.staging_dir,
+        }
+    else:
+        sign, pipeline_options = sign_batch, {}
+    try:
+        results = sign(
+            jobs,
+            workers=args.workers or None,
+            backend=args.backend,
+            incremental=args.incremental,
+            streaming=args.streaming,
+            signature_cache_dir=args.signature_cache,
+            signature_dpi=args.signature_dpi,
+            signature_encoding=args.signature_encoding,
+            output_cache_dir=args.output_cache,
+            profiler=args.profile,
+            profile_dir=args.profile_dir,
+            on_result=print_result,
+            **pipeline_options
+        )
+    except ValueError as e:
+        print(f"✗ {e}")
+        return 2
+    print_summary(results, time.perf_counter() - start_time)
+    if args.metrics:
+        write_metrics(results, args.metrics)
+    return 1 if any(r['error'] for r in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,14 +3,17 @@ from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QLineEdit, QPushButton, QFileDialog, QComboBox, QSlider, 
     QGraphicsView, QGraphicsScene, QGraphicsPixmapItem, QMessageBox,
-    QGroupBox, QScrollArea, QSplitter
+    QGroupBox, QScrollArea, QSplitter, QProgressBar
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QPointF
-from PyQt6.QtGui import QPixmap, QImage
-from PIL.ImageQt import ImageQt
+import math
+from PyQt6.QtCore import Qt, pyqtSignal, QPointF, QTimer
+from PyQt6.QtGui import QPixmap, QImage, QTransform
 
-from pdf_processor import PDFProcessor
+from pdf_processor import PDFProcessor, DEFAULT_DPI, PREVIEW_DPI, TILE_SIZE
+from render_worker import PageRenderWorker, tile_format
+from signing_worker import SigningWorker
 from utils import parse_page_ranges
+from templates import load_template, save_template, template_from_positions
 
 class MovablePixmapItem(QGraphicsPixmapItem):
     def __init__(self, pixmap, parent=None):
@@ -18,6 +21,17 @@ class MovablePixmapItem(QGraphicsPixmapItem):
         self.setFlag(QGraphicsPixmapItem.GraphicsItemFlag.ItemIsMovable, True)
         self.setFlag(QGraphicsPixmapItem.GraphicsItemFlag.ItemSendsGeometryChanges, True)
 
+class ZoomableGraphicsView(QGraphicsView):
+    zoom_requested = pyqtSignal(float)
+
+    def wheelEvent(self, event):
+        # Ctrl + wheel zooms, plain wheel keeps scrolling
+        if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            self.zoom_requested.emit(1.25 if event.angleDelta().y() > 0 else 0.8)
+            event.accept()
+        else:
+            super().wheelEvent(event)
+
 class SignaturePDFGUI(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -25,6 +39,11 @@ class SignaturePDFGUI(QMainWindow):
         self.resize(1024, 768)
         
         self.pdf_processor = PDFProcessor()
+        self.render_worker = PageRenderWorker(self.pdf_processor, prefetch_count=2)
+        self.render_worker.page_rendered.connect(self.on_page_rendered)
+        self.render_worker.tile_rendered.connect(self.on_tile_rendered)
+        self.render_worker.render_failed.connect(self.on_render_failed)
+        self.render_worker.start()
         
         # State variables
         self.input_pdf_path = ""
@@ -32,8 +51,11 @@ class SignaturePDFGUI(QMainWindow):
         self.output_pdf_path = os.path.join(os.getcwd(), "output.pdf")
         
         self.saved_positions = {}  # page_num (int): {'x': float, 'y': float, 'scale': float}
+        self.active_template = None  # re-applied to every newly opened PDF
         self.current_page = 0
         self.signature_scale = 0.5
+        self.zoom = 1.0
+        self.dpi_scale = DEFAULT_DPI / 72.0  # scene pixels per PDF point
         
         self.setup_ui()
 
@@ -106,6 +128,22 @@ class SignaturePDFGUI(QMainWindow):
         scale_hlayout.addWidget(self.scale_label)
         page_layout.addLayout(scale_hlayout)
         
+        zoom_hlayout = QHBoxLayout()
+        zoom_hlayout.addWidget(QLabel("Zoom:"))
+        btn_zoom_out = QPushButton("-")
+        btn_zoom_out.clicked.connect(lambda: self.set_zoom(self.zoom * 0.8))
+        zoom_hlayout.addWidget(btn_zoom_out)
+        self.zoom_label = QLabel("100%")
+        self.zoom_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        zoom_hlayout.addWidget(self.zoom_label)
+        btn_zoom_in = QPushButton("+")
+        btn_zoom_in.clicked.connect(lambda: self.set_zoom(self.zoom * 1.25))
+        zoom_hlayout.addWidget(btn_zoom_in)
+        btn_zoom_reset = QPushButton("100%")
+        btn_zoom_reset.clicked.connect(lambda: self.set_zoom(1.0))
+        zoom_hlayout.addWidget(btn_zoom_reset)
+        page_layout.addLayout(zoom_hlayout)
+        
         btn_save_pos = QPushButton("Save Position for Current Page")
         btn_save_pos.clicked.connect(self.save_position)
         page_layout.addWidget(btn_save_pos)
@@ -114,6 +152,24 @@ class SignaturePDFGUI(QMainWindow):
         btn_clear_pos.clicked.connect(self.clear_position)
         page_layout.addWidget(btn_clear_pos)
         
+        anchor_hlayout = QHBoxLayout()
+        self.anchor_edit = QLineEdit()
+        self.anchor_edit.setPlaceholderText("Anchor regex (default: Signature:, Signed by)")
+        btn_find_anchors = QPushButton("Place at Anchors")
+        btn_find_anchors.clicked.connect(self.place_at_anchors)
+        anchor_hlayout.addWidget(self.anchor_edit)
+        anchor_hlayout.addWidget(btn_find_anchors)
+        page_layout.addLayout(anchor_hlayout)
+        
+        template_hlayout = QHBoxLayout()
+        btn_load_template = QPushButton("Load Template")
+        btn_load_template.clicked.connect(self.load_template_file)
+        template_hlayout.addWidget(btn_load_template)
+        btn_save_template = QPushButton("Save Template")
+        btn_save_template.clicked.connect(self.save_template_file)
+        template_hlayout.addWidget(btn_save_template)
+        page_layout.addLayout(template_hlayout)
+        
         self.status_label = QLabel("Saved Pages: None")
         self.status_label.setWordWrap(True)
         page_layout.addWidget(self.status_label)
@@ -141,6 +197,17 @@ class SignaturePDFGUI(QMainWindow):
         range_hlayout.addWidget(self.range_edit)
         range_hlayout.addWidget(btn_process_range)
         process_layout.addLayout(range_hlayout)
+        self.process_buttons = [btn_process_current, btn_process_all, btn_process_range]
+        
+        progress_hlayout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        progress_hlayout.addWidget(self.progress_bar)
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.setVisible(False)
+        self.btn_cancel.clicked.connect(self.cancel_processing)
+        progress_hlayout.addWidget(self.btn_cancel)
+        process_layout.addLayout(progress_hlayout)
         
         process_group.setLayout(process_layout)
         controls_layout.addWidget(process_group)
@@ -150,8 +217,17 @@ class SignaturePDFGUI(QMainWindow):
         
         # Right Panel - PDF Viewer
         self.scene = QGraphicsScene()
-        self.view = QGraphicsView(self.scene)
+        self.view = ZoomableGraphicsView(self.scene)
         self.view.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
+        self.view.zoom_requested.connect(lambda factor: self.set_zoom(self.zoom * factor))
+        
+        # Deep-zoom tiles follow the viewport; refresh them shortly after scrolling settles
+        self.tile_timer = QTimer(self)
+        self.tile_timer.setSingleShot(True)
+        self.tile_timer.setInterval(50)
+        self.tile_timer.timeout.connect(self.update_visible_tiles)
+        self.view.horizontalScrollBar().valueChanged.connect(lambda _: self.tile_timer.start())
+        self.view.verticalScrollBar().valueChanged.connect(lambda _: self.tile_timer.start())
         
         # Add to splitter
         splitter.addWidget(controls_widget)
@@ -161,21 +237,33 @@ class SignaturePDFGUI(QMainWindow):
         self.pdf_background_item = None
         self.signature_item = None
         self.original_sig_pixmap = None
+        self.displayed_page = None
+        self.displayed_render_scale = 0.0
+        self.tile_items = {}  # (dpi, col, row): QGraphicsPixmapItem
+        self.signing_worker = None
 
     def browse_pdf(self):
+        if self.signing_worker and self.signing_worker.isRunning():
+            # Signing reads the loaded PDF's mapping, so it has to stay open until the run ends
+            QMessageBox.information(self, "Busy", "Wait for signing to finish or cancel it before opening another PDF.")
+            return
         file_path, _ = QFileDialog.getOpenFileName(self, "Select PDF", "", "PDF Files (*.pdf)")
         if file_path:
             self.pdf_input_edit.setText(file_path)
             self.input_pdf_path = file_path
             try:
                 page_count = self.pdf_processor.load_pdf(file_path)
+                self.render_worker.set_document(file_path, page_count)
                 self.page_combo.blockSignals(True)
                 self.page_combo.clear()
                 self.page_combo.addItems([str(i) for i in range(page_count)])
                 self.page_combo.blockSignals(False)
                 self.saved_positions.clear()
+                if self.active_template:
+                    self.apply_template(self.active_template)
                 self.update_status_label()
                 self.current_page = 0
+                self.displayed_page = None
                 self.load_page()
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to load PDF: {str(e)}")
@@ -183,11 +271,25 @@ class SignaturePDFGUI(QMainWindow):
     def browse_signature(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Select Signature Image", "", "Image Files (*.png *.jpg *.jpeg)")
         if file_path:
+            try:
+                # Decoded once into the processor's signature cache, which signing reuses
+                signature = self.pdf_processor.load_signature(file_path)
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to load signature: {str(e)}")
+                return
             self.sig_input_edit.setText(file_path)
             self.signature_path = file_path
-            self.original_sig_pixmap = QPixmap(file_path)
+            self.original_sig_pixmap = self.signature_pixmap(signature)
             self.load_signature_item()
 
+    def signature_pixmap(self, signature):
+        """Builds a QPixmap from a SignatureAsset's premultiplied pixels without re-reading the file."""
+        image = signature.premultiplied
+        data = image.tobytes()
+        qimage = QImage(data, image.width, image.height, image.width * 4, QImage.Format.Format_RGBA8888_Premultiplied)
+        # fromImage copies, so data only has to outlive this call
+        return QPixmap.fromImage(qimage)
+
     def browse_output(self):
         file_path, _ = QFileDialog.getSaveFileName(self, "Select Output PDF", self.output_pdf_path, "PDF Files (*.pdf)")
         if file_path:
@@ -198,17 +300,131 @@ class SignaturePDFGUI(QMainWindow):
         if not self.input_pdf_path:
             return
             
+        # Page size is known without rendering, so positioning works before the first paint
+        self.orig_pdf_width_pts, self.orig_pdf_height_pts = self.pdf_processor.get_page_size(self.current_page)
+        
+        # Show the best cached render straight away, and let the render thread fill in the rest:
+        # a low-DPI preview first (if nothing is cached), then a render matched to the view zoom
+        page_dpi = self._page_render_dpi()
+        cached = self.pdf_processor.get_cached_page_image(self.current_page, self.input_pdf_path, page_dpi, "qimage")
+        if cached is None:
+            cached = self.pdf_processor.get_cached_page_image(self.current_page, self.input_pdf_path, PREVIEW_DPI, "qimage")
+        self.render_worker.request_page(self.current_page, page_dpi)
+        if cached is not None:
+            self.show_page_image(cached)
+        if cached is None or cached[3] < page_dpi / 72.0:
+            self.statusBar().showMessage(f"Rendering page {self.current_page}...")
+        self.tile_timer.start()
+
+    def _target_render_dpi(self):
+        """DPI at which one rendered pixel maps to one screen pixel at the current view zoom."""
+        zoom = self.view.transform().m11()
+        return max(PREVIEW_DPI, int(round(DEFAULT_DPI * zoom)))
+
+    def _page_render_dpi(self):
+        """DPI for whole-page renders: the view DPI, but never above 150 DPI or the page's
+        pixel budget. Anything sharper is filled in with tiles of the visible region."""
+        page_dpi = min(self._target_render_dpi(), DEFAULT_DPI, self.pdf_processor.max_page_render_dpi(self.current_page))
+        return max(1, page_dpi)
+
+    def set_zoom(self, zoom):
+        self.zoom = min(max(zoom, 0.25), 8.0)
+        self.view.setTransform(QTransform.fromScale(self.zoom, self.zoom))
+        self.zoom_label.setText(f"{self.zoom * 100:.0f}%")
+        self.load_page()
+
+    def on_page_rendered(self, pdf_path, page_num, result):
+        if pdf_path != self.input_pdf_path or page_num != self.current_page:
+            return
+        # Never replace a sharper render of the same page with a preview
+        if self.displayed_page == (pdf_path, page_num) and result[3] <= self.displayed_render_scale:
+            return
+        self.show_page_image(result)
+
+    def update_visible_tiles(self):
+        """Shows or requests the tiles covering the viewport when the zoom needs more detail
+        than the whole-page render has, and drops tiles that are no longer visible."""
+        if self.displayed_page != (self.input_pdf_path, self.current_page):
+            self._clear_tiles()
+            return
+        
+        target_dpi = self._target_render_dpi()
+        if target_dpi <= self._page_render_dpi():
+            self._clear_tiles()
+            return
+        
+        # Work in scene units (150 DPI pixels); each tile covers TILE_SIZE pixels at target_dpi
+        tile_scene_size = TILE_SIZE * DEFAULT_DPI / target_dpi
+        visible = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        last_col = math.ceil(self.orig_pdf_width_pts * self.dpi_scale / tile_scene_size) - 1
+        last_row = math.ceil(self.orig_pdf_height_pts * self.dpi_scale / tile_scene_size) - 1
+        cols = range(max(0, int(visible.left() // tile_scene_size)), min(last_col, int(visible.right() // tile_scene_size)) + 1)
+        rows = range(max(0, int(visible.top() // tile_scene_size)), min(last_row, int(visible.bottom() // tile_scene_size)) + 1)
+        wanted = {(target_dpi, col, row) for col in cols for row in rows}
+        
+        for key in list(self.tile_items):
+            if key not in wanted:
+                self.scene.removeItem(self.tile_items.pop(key))
+        
+        missing = []
+        for dpi, col, row in sorted(wanted):
+            if (dpi, col, row) in self.tile_items:
+                continue
+            cached = self.pdf_processor.get_cached_page_image(self.current_page, self.input_pdf_path, dpi, tile_format(col, row))
+            if cached is not None:
+                self._add_tile_item(dpi, col, row, cached[0])
+            else:
+                missing.append((col, row))
+        self.render_worker.request_tiles(self.current_page, target_dpi, missing)
+
+    def on_tile_rendered(self, pdf_path, page_num, dpi, col, row, qimage):
+        if pdf_path != self.input_pdf_path or page_num != self.current_page:
+            return
+        if dpi != self._target_render_dpi() or (dpi, col, row) in self.tile_items:
+            return
+        self._add_tile_item(dpi, col, row, qimage)
+
+    def _add_tile_item(self, dpi, col, row, qimage):
+        tile_scene_size = TILE_SIZE * DEFAULT_DPI / dpi
+        item = self.scene.addPixmap(QPixmap.fromImage(qimage))
+        item.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
+        item.setScale(DEFAULT_DPI / dpi)
+        item.setPos(col * tile_scene_size, row * tile_scene_size)
+        item.setZValue(-0.5) # above the page render, below the signature
+        self.tile_items[(dpi, col, row)] = item
+
+    def _clear_tiles(self):
+        for item in self.tile_items.values():
+            self.scene.removeItem(item)
+        self.tile_items.clear()
+
+    def on_render_failed(self, pdf_path, page_num, message):
+        if pdf_path == self.input_pdf_path and page_num == self.current_page:
+            self.statusBar().clearMessage()
+            QMessageBox.critical(self, "Error", f"Failed to load page: {message}")
+
+    def show_page_image(self, page_image):
         try:
-            pil_img, self.orig_pdf_width_pts, self.orig_pdf_height_pts, self.dpi_scale = self.pdf_processor.get_page_image(self.current_page, self.input_pdf_path)
+            qimage, self.orig_pdf_width_pts, self.orig_pdf_height_pts, render_scale = page_image
+            # Scene coordinates stay in 150 DPI pixels whatever resolution the page was rendered at
+            self.dpi_scale = DEFAULT_DPI / 72.0
+            # A sharper re-render of the page already on screen must not reset the signature
+            is_new_page = self.displayed_page != (self.input_pdf_path, self.current_page)
+            if is_new_page:
+                self._clear_tiles()
+            self.displayed_page = (self.input_pdf_path, self.current_page)
+            self.displayed_render_scale = render_scale
+            if render_scale >= self._page_render_dpi() / 72.0:
+                self.statusBar().clearMessage()
             
-            # Convert PIL Image to QPixmap
-            qimage = ImageQt(pil_img)
             pixmap = QPixmap.fromImage(qimage)
             
             if self.pdf_background_item:
                 self.scene.removeItem(self.pdf_background_item)
             
             self.pdf_background_item = self.scene.addPixmap(pixmap)
+            self.pdf_background_item.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
+            self.pdf_background_item.setScale(self.dpi_scale / render_scale)
             self.pdf_background_item.setZValue(-1) # ensure it stays behind the signature
             # The scene coordinates are now exactly matched to the rendered image pixels.
             
@@ -217,7 +433,7 @@ class SignaturePDFGUI(QMainWindow):
                 self.load_signature_item()
                 
             # Restore saved position if any
-            if self.current_page in self.saved_positions:
+            if is_new_page and self.current_page in self.saved_positions:
                 pos_data = self.saved_positions[self.current_page]
                 self.scale_slider.setValue(int(pos_data['scale'] * 100))
                 # Map PDF points back to scene pixels
@@ -227,11 +443,12 @@ class SignaturePDFGUI(QMainWindow):
                 # Bottom-left to top-left mapping:
                 # pdf_y = original_pdf_height - (scene_y * 72/150) - (sig_scene_height * 72/150)
                 # scene_y = (original_pdf_height - pdf_y) * (150/72) - sig_scene_height
-                sig_scene_height = self.orig_sig_height_scene * pos_data['scale']
+                sig_scene_height = self.orig_sig_height_scene * pos_data['scale'] * self.dpi_scale
                 scene_y = (self.orig_pdf_height_pts - pos_data['y']) * self.dpi_scale - sig_scene_height
                 
                 self.signature_item.setPos(scene_x, scene_y)
             
+            self.tile_timer.start()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load page: {str(e)}")
 
@@ -262,6 +479,15 @@ class SignaturePDFGUI(QMainWindow):
             self.current_page = index
             self.load_page()
 
+    def closeEvent(self, event):
+        if self.signing_worker and self.signing_worker.isRunning():
+            self.signing_worker.cancel()
+            self.signing_worker.wait()
+        self.render_worker.stop()
+        # Page cache and signing totals for the session, through the instrumentation sinks
+        self.pdf_processor.report_metrics()
+        super().closeEvent(event)
+
     def on_scale_changed(self, value):
         self.signature_scale = value / 100.0
         self.scale_label.setText(f"{self.signature_scale:.2f}")
@@ -327,6 +553,81 @@ class SignaturePDFGUI(QMainWindow):
             del self.saved_positions[self.current_page]
             self.update_status_label()
 
+    def place_at_anchors(self):
+        """Saves a position at every anchor text match, sized like the current signature."""
+        if not self.input_pdf_path or not self.signature_item:
+            QMessageBox.warning(self, "Warning", "Please select input PDF and signature.")
+            return
+        
+        size = self._get_signature_pdf_coordinates_and_size()
+        options = {}
+        if self.anchor_edit.text().strip():
+            options['patterns'] = [self.anchor_edit.text().strip()]
+        try:
+            placements = self.pdf_processor.find_anchor_placements(size['width'], size['height'], **options)
+        except ValueError as e:
+            QMessageBox.warning(self, "Warning", str(e))
+            return
+        if not placements:
+            QMessageBox.information(self, "Anchors", "No anchor text found.")
+            return
+        
+        # The GUI keeps one position per page, so the first match on each page wins
+        for placement in reversed(placements):
+            data = dict(placement)
+            page_num = data.pop('page_num')
+            data['scale'] = self.signature_scale
+            self.saved_positions[page_num] = data
+        self.update_status_label()
+        # Redisplay so the signature jumps to the anchor on the current page
+        self.displayed_page = None
+        self.load_page()
+
+    def load_template_file(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Load Placement Template", "", "Template Files (*.json)")
+        if not file_path:
+            return
+        try:
+            template = load_template(file_path)
+        except ValueError as e:
+            QMessageBox.warning(self, "Warning", str(e))
+            return
+        self.active_template = template
+        if self.input_pdf_path:
+            self.saved_positions.clear()
+            self.apply_template(template)
+            self.update_status_label()
+            self.displayed_page = None
+            self.load_page()
+
+    def save_template_file(self):
+        if not self.saved_positions:
+            QMessageBox.warning(self, "Warning", "No saved positions. Click 'Save Position' for pages first.")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Placement Template", "", "Template Files (*.json)")
+        if not file_path:
+            return
+        try:
+            template = template_from_positions(self.pdf_processor.pdf_doc, self.saved_positions, os.path.splitext(os.path.basename(file_path))[0])
+            save_template(file_path, template)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"Failed to save template: {str(e)}")
+            return
+        self.active_template = template
+
+    def apply_template(self, template):
+        """Fills saved_positions from a template; the GUI keeps the first placement per page."""
+        try:
+            placements = self.pdf_processor.apply_template(template)
+        except ValueError as e:
+            QMessageBox.warning(self, "Warning", str(e))
+            return
+        for placement in reversed(placements):
+            data = dict(placement)
+            page_num = data.pop('page_num')
+            data['scale'] = data['width'] / self.orig_sig_width_scene if self.signature_item else self.signature_scale
+            self.saved_positions[page_num] = data
+
     def update_status_label(self):
         if not self.saved_positions:
             self.status_label.setText("Saved Pages: None")
@@ -397,15 +698,64 @@ class SignaturePDFGUI(QMainWindow):
         if not sig_data:
             QMessageBox.warning(self, "Warning", "No valid signature operations generated.")
             return
+        if self.signing_worker and self.signing_worker.isRunning():
+            return
             
-        try:
-            self.output_pdf_path = self.out_input_edit.text()
-            self.pdf_processor.add_signatures_to_pdf(
-                self.input_pdf_path, 
-                self.signature_path, 
-                self.output_pdf_path, 
-                sig_data
-            )
-            QMessageBox.information(self, "Success", f"Saved signed PDF to:\n{self.output_pdf_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to process PDF: {str(e)}")
\ No newline at end of file
+        self.output_pdf_path = self.out_input_edit.text()
+        self.signing_worker = SigningWorker(
+            self.pdf_processor,
+            self.input_pdf_path, 
+            self.signature_path, 
+            self.output_pdf_path, 
+            sig_data
+        )
+        self.signing_worker.progress.connect(self.on_processing_progress)
+        self.signing_worker.saving.connect(self.on_processing_saving)
+        self.signing_worker.succeeded.connect(self.on_processing_succeeded)
+        self.signing_worker.failed.connect(self.on_processing_failed)
+        self.signing_worker.cancelled.connect(self.on_processing_cancelled)
+        self._set_processing(True)
+        self.signing_worker.start()
+
+    def cancel_processing(self):
+        if self.signing_worker and self.signing_worker.isRunning():
+            self.btn_cancel.setEnabled(False)
+            self.statusBar().showMessage("Cancelling...")
+            self.signing_worker.cancel()
+
+    def _set_processing(self, running):
+        for button in self.process_buttons:
+            button.setEnabled(not running)
+        self.progress_bar.setVisible(running)
+        self.progress_bar.setRange(0, 0) # busy until the first progress report
+        self.btn_cancel.setVisible(running)
+        self.btn_cancel.setEnabled(running)
+        if running:
+            self.statusBar().showMessage("Processing...")
+        else:
+            self.statusBar().clearMessage()
+
+    def on_processing_progress(self, done, total):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+        self.statusBar().showMessage(f"Processing page {done} of {total}...")
+
+    def on_processing_saving(self):
+        self.progress_bar.setRange(0, 0)
+        self.btn_cancel.setEnabled(False)
+        self.statusBar().showMessage("Saving... (this can no longer be cancelled)")
+        # The write blocks this thread too, so paint the new state before letting it start
+        self.repaint()
+        self.signing_worker.saving_shown()
+
+    def on_processing_succeeded(self, output_pdf_path):
+        self._set_processing(False)
+        QMessageBox.information(self, "Success", f"Saved signed PDF to:\n{output_pdf_path}")
+
+    def on_processing_failed(self, message):
+        self._set_processing(False)
+        QMessageBox.critical(self, "Error", f"Failed to process PDF: {message}")
+
+    def on_processing_cancelled(self):
+        self._set_processing(False)
+        self.statusBar().showMessage("Processing cancelled; no output was written.", 5000)
@@ -0,0 +1,172 @@
+"""
+Structured timing, counters and optional profiling for PDFProcessor.
+
+Every instrumented call produces one record, a plain dict such as
+    {
+        "event": "operation", "operation": "add_signatures_to_pdf",
+        "seconds": 1.92, "error": None, "backend": "pypdf2", ...,
+        "stages": {"parse": 0.01, "image_prep": 0.02, "merge": 1.31, "serialize": 0.55, "write": 0.03},
+        "counters": {"pages": 1000, "pages_stamped": 1, "placements": 1, "bytes_written": 8893541}
+    }
+that goes to the callback and the logger given to Instrumentation.
+
+Signing stages:
+    cache_lookup   output cache key and lookup
+    parse          opening the input and reading its page tree (PyPDF2 reads
+                   page objects lazily, so the rest of its parsing is in merge)
+    image_prep     signature decode, downsampling and encoding
+    overlay_build  copying the signature XObject into the output
+    merge          stamping pages and copying them into the writer
+    serialize      writing the output document into its partial file
+    write          moving the output into place and storing it in the output cache
+"""
+
+import io
+import os
+import time
+import logging
+import threading
+import contextlib
+
+logger = logging.getLogger(__name__)
+
+PROFILERS = ("cprofile", "pyinstrument")
+PROFILE_TOP_ENTRIES = 25
+
+class Operation:
+    """Stage timers and counters of one instrumented call."""
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = dict(fields)
+        self.stages = {}
+        self.counters = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Adds the time spent in the block to stage name; a stage may be entered many times."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+class Instrumentation:
+    """
+    Emits one record per operation to callback (callable(record)) and to
+    logger at INFO level (defaults to this module's logger, silent unless
+    logging is configured). Totals across operations are kept for totals().
+
+    profiler: None, "cprofile" or "pyinstrument" (needs the pyinstrument
+        package) to profile every operation. The record's "profile" holds the
+        report as text, or the path of the saved profile when profile_dir is
+        set (.prof files for cprofile, .html for pyinstrument).
+    """
+
+    def __init__(self, callback=None, logger=logger, profiler=None, profile_dir=None):
+        if profiler not in (None,) + PROFILERS:
+            raise ValueError(f"Unknown profiler: {profiler}. Use one of: {', '.join(PROFILERS)}")
+        if profiler == "pyinstrument":
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError:
+                raise ValueError("The pyinstrument profiler needs the pyinstrument package (pip install pyinstrument).")
+        self.callback = callback
+        self.logger = logger
+        self.profiler = profiler
+        self.profile_dir = profile_dir
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._totals = {'operations': {}, 'stages': {}, 'counters': {}}
+
+    @contextlib.contextmanager
+    def operation(self, name, **fields):
+        """Times the block as operation name and emits its record; fields are copied into the record."""
+        op = Operation(name, fields)
+        profiler = self._start_profiler()
+        error = None
+        start = time.perf_counter()
+        try:
+            yield op
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            record = {'event': 'operation', 'operation': name, 'seconds': seconds, 'error': error}
+            record.update(op.fields)
+            record['stages'] = op.stages
+            record['counters'] = op.counters
+            if profiler:
+                record['profile'] = self._stop_profiler(profiler, name)
+            self._add_to_totals(record)
+            self.emit(record)
+
+    def emit(self, record):
+        """Sends a record to the callback and the logger."""
+        if self.callback:
+            self.callback(record)
+        if self.logger and self.logger.isEnabledFor(logging.INFO):
+            if record.get('event') == 'operation':
+                stages = ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in record['stages'].items())
+                outcome = f"failed ({record['error']}) after" if record['error'] else "took"
+                self.logger.info("%s %s %.3f s (%s)", record['operation'], outcome, record['seconds'], stages, extra={'record': record})
+            else:
+                self.logger.info("%s: %s", record.get('event'), record, extra={'record': record})
+
+    def totals(self):
+        """Returns operation counts, summed stage seconds and summed counters of every operation so far."""
+        with self._lock:
+            return {group: dict(values) for group, values in self._totals.items()}
+
+    def _add_to_totals(self, record):
+        with self._lock:
+            operations = self._totals['operations']
+            operations[record['operation']] = operations.get(record['operation'], 0) + 1
+            for group in ('stages', 'counters'):
+                totals = self._totals[group]
+                for key, value in record[group].items():
+                    totals[key] = totals.get(key, 0) + value
+
+    def _start_profiler(self):
+        if self.profiler == "cprofile":
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return profiler
+        if self.profiler == "pyinstrument":
+            import pyinstrument
+            profiler = pyinstrument.Profiler()
+            profiler.start()
+            return profiler
+        return None
+
+    def _stop_profiler(self, profiler, name):
+        if self.profiler == "cprofile":
+            profiler.disable()
+            if self.profile_dir:
+                path = self._profile_path(name, ".prof")
+                profiler.dump_stats(path)
+                return path
+            import pstats
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(PROFILE_TOP_ENTRIES)
+            return report.getvalue()
+        profiler.stop()
+        if self.profile_dir:
+            path = self._profile_path(name, ".html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(profiler.output_html())
+            return path
+        return profiler.output_text()
+
+    def _profile_path(self, name, extension):
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+        return os.path.join(self.profile_dir, f"{name}-{os.getpid()}-{sequence}{extension}")
@@ -0,0 +1,118 @@
+import os
+import json
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Bump whenever a code change alters the bytes written for the same request
+OUTPUT_CACHE_VERSION = 2
+# Input digests remembered; a service signs a new temporary path per request, so the memo must not grow with them
+DIGEST_MEMO_ENTRIES = 256
+
+class OutputCache:
+    """
+    Content-addressed store of signed PDFs. The key covers the input PDF's
+    bytes, the signature image's content digest, the normalized placements
+    and every option that changes the output, so an identical request can
+    reuse the earlier result instead of signing again.
+
+    Results are hard-linked between the cache and the output path when both
+    are on the same filesystem (link=True) and copied otherwise. Hard-linked
+    outputs share their bytes with the cache, so edit copies of them, not the
+    files themselves.
+    """
+
+    def __init__(self, cache_dir, link=True):
+        self.cache_dir = cache_dir
+        self.link = link
+        self.hits = 0
+        self.misses = 0
+        self._digests = OrderedDict()  # (path, mtime_ns, size): content digest, least recently used first
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key_for(self, source, signature_key, signature_data, options):
+        """
+        Returns the cache key of a signing request for a PdfSource; options is a
+        dict of output-affecting settings. signature_data must already be
+        validated (see PDFProcessor._validate_placements): the key is built from
+        it as is, so a page number is never coerced into a valid one.
+        """
+        placements = sorted(
+            (sig['page_num'], round(float(sig['x']), 4), round(float(sig['y']), 4),
+             round(float(sig['width']), 4), round(float(sig['height']), 4))
+            for sig in signature_data
+        )
+        request = {
+            'version': OUTPUT_CACHE_VERSION,
+            'input': self._digest(source),
+            'signature': signature_key,
+            'placements': placements,
+            'options': options,
+        }
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def fetch(self, key, output_pdf_path):
+        """Places the cached result for key at output_pdf_path; returns its page count, or None on a miss."""
+        cached_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                page_count = json.load(f)['pages']
+            if not (os.path.exists(output_pdf_path) and os.path.samefile(cached_path, output_pdf_path)):
+                self._place(cached_path, output_pdf_path)
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return page_count
+
+    def store(self, key, output_pdf_path, page_count):
+        """Records a freshly written output under key."""
+        cached_path, meta_path = self._paths(key)
+        self._place(output_pdf_path, cached_path)
+        # The metadata goes last: an entry only counts once it is complete
+        partial_path = f"{meta_path}.{os.getpid()}.part"
+        with open(partial_path, 'w', encoding='utf-8') as f:
+            json.dump({'pages': page_count}, f)
+        os.replace(partial_path, meta_path)
+
+    def stats(self):
+        """Returns counters for diagnostics."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def _paths(self, key):
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + ".pdf", base + ".json"
+
+    def _place(self, source_path, destination_path):
+        """Atomically makes destination_path a hard link to (or copy of) source_path."""
+        os.makedirs(os.path.dirname(os.path.abspath(destination_path)), exist_ok=True)
+        partial_path = f"{destination_path}.{os.getpid()}.part"
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        try:
+            if not self.link:
+                raise OSError("hard links disabled")
+            os.link(source_path, partial_path)
+        except OSError:
+            shutil.copyfile(source_path, partial_path)
+        os.replace(partial_path, destination_path)
+
+    def _digest(self, source):
+        # Rehash only when the file changed, so a repeated request skips hashing it again
+        stat_key = (source.path,) + source.stat_key
+        with self._lock:
+            digest = self._digests.get(stat_key)
+            if digest is not None:
+                self._digests.move_to_end(stat_key)
+                return digest
+        digest = source.digest()
+        with self._lock:
+            self._digests[stat_key] = digest
+            while len(self._digests) > DIGEST_MEMO_ENTRIES:
+                self._digests.popitem(last=False)
+        return digest
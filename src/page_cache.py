@@ -0,0 +1,77 @@
+import threading
+from collections import OrderedDict
+
+class PageCache:
+    """
+    Least-recently-used cache of rendered pages bounded by a byte budget.
+    Values are (image, original_width_pts, original_height_pts, dpi_scale)
+    tuples as returned by PDFProcessor.get_page_image, where image is a
+    PIL.Image or a QImage.
+    Safe to share between the GUI thread and the background render thread.
+    """
+
+    def __init__(self, max_mb=512):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key: (value, size_in_bytes)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the cached value and marks it most recently used, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = self._size_of(value)
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                # A single page larger than the whole budget is returned but never kept
+                return
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Returns counters for diagnostics."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _size_of(value):
+        image = value[0]
+        if hasattr(image, 'sizeInBytes'):
+            return image.sizeInBytes()
+        return image.width * image.height * len(image.getbands())
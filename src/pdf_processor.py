@@ -1,28 +1,55 @@
 import os
-import time
-import fitz
-from PyPDF2 import PdfReader, PdfWriter
-from PIL import Image
 import io
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
+
+# fitz, PIL, PyPDF2 and ReportLab (via signature_cache) are imported where they
+# are first needed, not here: the GUI imports this module before its window
+# can appear, and PyPDF2 and ReportLab are only needed once something is signed.
+
+from page_cache import PageCache
+from instrumentation import Instrumentation
+from pdf_source import PdfSource
+from output_cache import OutputCache
+from placement import TextIndex, find_anchor_placements
+from templates import template_placements
+from signature_cache import SignatureAsset, SignatureCache, SIGNATURE_ENCODINGS
+
+BACKENDS = ("pypdf2", "pymupdf")
+SIGNATURE_XOBJECT_NAME = "/SigPDFImage"
+DEFAULT_DPI = 150
+PREVIEW_DPI = 36
+TILE_SIZE = 512  # pixels per side of a deep-zoom tile
+MAX_PAGE_PIXELS = 16 * 1024 * 1024  # larger whole-page renders are replaced by tiles
+RENDER_BAND_PIXELS = 256 * 1024  # pixels rasterized per call by render_banded_pixmap
+RENDER_BAND_MARGIN = 32  # extra pixel rows rendered around each band, see render_banded_pixmap
+
+class ProcessingCancelled(Exception):
+    """Raised from a progress_callback to abort add_signatures_to_pdf."""
 
 class PDFProcessor:
-    def __init__(self):
+    def __init__(self, cache_max_mb=512, signature_cache_dir=None, output_cache_dir=None, instrumentation=None):
         self.pdf_doc = None
+        self.pdf_source = None
         self.page_count = 0
-        self.page_cache = {}
+        self.page_cache = PageCache(cache_max_mb)
+        self.text_index = None
+        self.signature_cache = SignatureCache(signature_cache_dir)
+        # Opt-in: reuse earlier outputs of identical signing requests
+        self.output_cache = OutputCache(output_cache_dir) if output_cache_dir else None
+        # Stage timings and counters of every signing call; see instrumentation.py
+        self.instrumentation = instrumentation or Instrumentation()
 
     def load_pdf(self, pdf_path):
         """Loads a PDF and returns the number of pages."""
         if not os.path.exists(pdf_path):
             raise ValueError(f"Input PDF not found at: {pdf_path}")
 
-        if self.pdf_doc:
-            self.pdf_doc.close()
+        self._close_pdf()
         
-        self.pdf_doc = fitz.open(pdf_path)
+        # Mapped once; signing the same unchanged file reuses the mapping instead of reading it again
+        self.pdf_source = PdfSource(pdf_path)
+        self.pdf_doc = self.pdf_source.open_fitz()
         self.page_count = len(self.pdf_doc)
+        self.text_index = TextIndex(self.pdf_doc)
         
         if self.page_count == 0:
             raise ValueError("PDF is empty.")
@@ -30,7 +57,32 @@ class PDFProcessor:
         self.page_cache.clear()
         return self.page_count
 
-    def get_page_image(self, page_num, pdf_path):
+    def _close_pdf(self):
+        # The document borrows the source's buffer, so it has to go first
+        if self.pdf_doc:
+            self.pdf_doc.close()
+            self.pdf_doc = None
+        if self.pdf_source:
+            self.pdf_source.close()
+            self.pdf_source = None
+
+    def open_source(self, pdf_path):
+        """
+        Returns (PdfSource, owned) for pdf_path: the loaded PDF's mapping when it
+        is the same, unchanged file, otherwise a new mapping the caller must close
+        (owned is True).
+        """
+        if isinstance(pdf_path, PdfSource):
+            return pdf_path, False
+        if self.is_loaded(pdf_path) and self.pdf_source.is_current():
+            return self.pdf_source, False
+        return PdfSource(pdf_path), True
+
+    def is_loaded(self, pdf_path):
+        """True if pdf_path is the PDF opened with load_pdf."""
+        return bool(self.pdf_source) and self.pdf_source.path == os.path.abspath(pdf_path)
+
+    def get_page_image(self, page_num, pdf_path, dpi=DEFAULT_DPI):
         """Returns (PIL.Image, original_width_pts, original_height_pts, dpi_scale_used)"""
         if not self.pdf_doc:
             raise ValueError("No PDF loaded.")
@@ -38,27 +90,137 @@ class PDFProcessor:
         if page_num >= self.page_count or page_num < 0:
             raise ValueError(f"Invalid page number: {page_num}")
 
-        cache_key = f"{pdf_path}_{page_num}"
-        if cache_key in self.page_cache:
-            return self.page_cache[cache_key]
+        cached = self.get_cached_page_image(page_num, pdf_path, dpi)
+        if cached is not None:
+            return cached
+
+        result = self.render_page(self.pdf_doc, page_num, dpi)
+        self.cache_page_image(page_num, pdf_path, result, dpi)
+        return result
+
+    def render_page(self, doc, page_num, dpi=DEFAULT_DPI):
+        """Rasterizes a page of an open fitz document without touching the cache.
+        Lets a render thread use its own document handle for the same file."""
+        from PIL import Image
+        pix, original_width, original_height, dpi_scale = self.render_pixmap(doc, page_num, dpi)
+        
+        # Wrap the raw RGB samples directly instead of round-tripping through a PPM codec
+        original_image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples).convert("RGBA")
+        
+        return (original_image, original_width, original_height, dpi_scale)
 
-        page = self.pdf_doc[page_num]
+    def render_pixmap(self, doc, page_num, dpi=DEFAULT_DPI, clip=None):
+        """Like render_page, but returns the raw RGB fitz.Pixmap for callers that
+        can use its sample buffer directly (e.g. wrapped in a QImage).
+        clip: optional fitz.Rect in page points to rasterize only that region."""
+        import fitz
+        page = doc[page_num]
         rect = page.rect
-        original_width = rect.width
-        original_height = rect.height
         
-        # Render at 150 DPI for good quality display (72 DPI is standard PDF)
-        dpi_scale = 150 / 72.0
+        # 150 DPI gives good quality display (72 DPI is standard PDF); previews use less
+        dpi_scale = dpi / 72.0
         mat = fitz.Matrix(dpi_scale, dpi_scale)
-        pix = page.get_pixmap(matrix=mat)
+        pix = page.get_pixmap(matrix=mat, clip=clip, alpha=False)
         
-        img_data = pix.tobytes("ppm")
-        original_image = Image.open(io.BytesIO(img_data)).convert("RGBA")
+        return (pix, rect.width, rect.height, dpi_scale)
+
+    def render_banded_pixmap(self, doc, page_num, dpi=DEFAULT_DPI, band_pixels=RENDER_BAND_PIXELS):
+        """Like render_pixmap, but rasterizes the page one horizontal band of about
+        band_pixels pixels at a time. fitz holds the GIL for a whole render, so a
+        dense page rendered on a background thread would freeze the GUI thread;
+        between bands it gets to run."""
+        import fitz
+        page = doc[page_num]
+        rect = page.rect
+        dpi_scale = dpi / 72.0
+        mat = fitz.Matrix(dpi_scale, dpi_scale)
+        irect = (rect * mat).irect
+        band_height = max(1, band_pixels // max(1, irect.width))
+        if irect.height <= band_height:
+            return self.render_pixmap(doc, page_num, dpi)
         
-        self.page_cache[cache_key] = (original_image, original_width, original_height, dpi_scale)
-        return self.page_cache[cache_key]
+        # Interpreted once; every band replays it
+        display_list = page.get_displaylist()
+        pix = fitz.Pixmap(fitz.csRGB, irect, False)
+        for y0 in range(irect.y0, irect.y1, band_height):
+            y1 = min(y0 + band_height, irect.y1)
+            # Anti-aliasing next to a clip edge differs from a whole-page render, so render a margin and keep only the band
+            clip = fitz.Rect(rect.x0, (y0 - RENDER_BAND_MARGIN) / dpi_scale, rect.x1, (y1 + RENDER_BAND_MARGIN) / dpi_scale) & rect
+            band = display_list.get_pixmap(matrix=mat, clip=clip, alpha=False)
+            pix.copy(band, fitz.IRect(irect.x0, y0, irect.x1, y1))
+        
+        return (pix, rect.width, rect.height, dpi_scale)
+
+    def render_tile_pixmap(self, doc, page_num, dpi, col, row, tile_size=TILE_SIZE):
+        """Renders the (col, row) tile_size-pixel tile of a page at dpi, counted from
+        the top-left corner. Returns the same tuple as render_pixmap."""
+        import fitz
+        page = doc[page_num]
+        step = tile_size / (dpi / 72.0)
+        clip = fitz.Rect(col * step, row * step, (col + 1) * step, (row + 1) * step) & page.rect
+        if clip.is_empty:
+            raise ValueError(f"Tile ({col}, {row}) is outside page {page_num}")
+        return self.render_pixmap(doc, page_num, dpi, clip)
 
-    def add_signatures_to_pdf(self, input_pdf_path, signature_path, output_pdf_path, signature_data):
+    def get_page_size(self, page_num):
+        """Returns (width_pts, height_pts) of a page of the loaded PDF without rendering it."""
+        if not self.pdf_doc:
+            raise ValueError("No PDF loaded.")
+        rect = self.pdf_doc[page_num].rect
+        return rect.width, rect.height
+
+    def max_page_render_dpi(self, page_num):
+        """Highest DPI at which a whole page stays within MAX_PAGE_PIXELS."""
+        width, height = self.get_page_size(page_num)
+        return int(72.0 * (MAX_PAGE_PIXELS / (width * height)) ** 0.5)
+
+    def get_cached_page_image(self, page_num, pdf_path, dpi=DEFAULT_DPI, image_format="pil"):
+        """Returns the cached get_page_image result for a page, or None.
+        image_format keeps PIL renders apart from other formats (e.g. the GUI's "qimage")."""
+        return self.page_cache.get(self._cache_key(page_num, pdf_path, dpi, image_format))
+
+    def is_page_cached(self, page_num, pdf_path, dpi=DEFAULT_DPI, image_format="pil"):
+        return self._cache_key(page_num, pdf_path, dpi, image_format) in self.page_cache
+
+    def cache_page_image(self, page_num, pdf_path, result, dpi=DEFAULT_DPI, image_format="pil"):
+        self.page_cache.put(self._cache_key(page_num, pdf_path, dpi, image_format), result)
+
+    def _cache_key(self, page_num, pdf_path, dpi, image_format):
+        return f"{pdf_path}_{page_num}_{dpi}_{image_format}"
+
+    def cache_stats(self):
+        """Returns page render cache counters (entries, bytes, hits, misses, evictions)."""
+        return self.page_cache.stats()
+
+    def report_metrics(self):
+        """Emits a "metrics" record with the cache counters and instrumentation totals, and returns it."""
+        record = {
+            'event': 'metrics',
+            'page_cache': self.page_cache.stats(),
+            'signature_cache': self.signature_cache.stats(),
+            'output_cache': self.output_cache.stats() if self.output_cache else None,
+            'totals': self.instrumentation.totals(),
+        }
+        self.instrumentation.emit(record)
+        return record
+
+    def find_anchor_placements(self, width, height, **options):
+        """
+        Returns signature_data placements next to anchor text in the loaded PDF,
+        reusing one text extraction per page across calls.
+        See placement.find_anchor_placements for the options.
+        """
+        if not self.pdf_doc:
+            raise ValueError("No PDF loaded.")
+        return find_anchor_placements(self.pdf_doc, width, height, text_index=self.text_index, **options)
+
+    def apply_template(self, template):
+        """Returns signature_data for the loaded PDF laid out by a placement template, without rendering."""
+        if not self.pdf_doc:
+            raise ValueError("No PDF loaded.")
+        return template_placements(self.pdf_doc, template, self.text_index)
+
+    def add_signatures_to_pdf(self, input_pdf_path, signature_path, output_pdf_path, signature_data, backend="pypdf2", incremental=False, progress_callback=None, streaming=False, signature_dpi=None, signature_encoding="flate"):
         """
         Adds signatures directly using PDF point coordinates.
         signature_data: list of dicts with keys:
@@ -67,62 +229,339 @@ class PDFProcessor:
             - 'y': y coordinate in PDF points (from bottom-left)
             - 'width': width in PDF points
             - 'height': height in PDF points
+        backend: "pypdf2" rewrites every page through PyPDF2's PdfWriter,
+            "pymupdf" inserts the image directly with fitz and saves in one pass.
+        incremental: append only the changed objects and a new xref section to a copy
+            of the original bytes instead of rewriting the file (pymupdf backend only).
+        streaming: write each page to disk as soon as it is stamped instead of building
+            the whole output in memory, so peak memory stays flat for very long
+            documents (pypdf2 backend only; encrypted input is not supported).
+        signature_dpi: if set, downsample the signature so it is embedded at no more
+            than this resolution at its largest placed size (e.g. 300).
+        signature_encoding: "flate" (lossless) or "jpeg" (JPEG color with a separate
+            lossless alpha mask, far smaller for photographed signatures).
+        progress_callback: optional callable(done, total) invoked as pages are processed;
+            raise ProcessingCancelled from it to abort. The output file only appears
+            once everything has been written, so an aborted or failed run leaves none.
+        With PDFProcessor(output_cache_dir=...), a request identical to an earlier one
+        (same input bytes, signature image, placements and options) places the earlier
+        output at output_pdf_path instead of signing again.
+        Every call emits an "add_signatures_to_pdf" record with stage timings and
+        counters through self.instrumentation.
+        Returns the number of pages in the output PDF.
         """
-        start_time = time.time()
-        reader = PdfReader(input_pdf_path)
-        writer = PdfWriter()
-        
-        sig_img = Image.open(signature_path).convert("RGBA")
-        
-        # Group signature data by page
+        return self._sign(input_pdf_path, signature_path, output_pdf_path, signature_data, backend, incremental, progress_callback, streaming, signature_dpi, signature_encoding)
+
+    def sign_loaded_pdf(self, signature_path, output_pdf_path, signature_data, progress_callback=None, signature_dpi=None, signature_encoding="flate", backend="pymupdf"):
+        """
+        Signs the PDF opened with load_pdf, for interactive saves. The output is
+        written from the mapping load_pdf made, and the pymupdf backend only reads
+        the cross-reference table and the stamped pages instead of parsing every
+        page again as pypdf2 does. Raises ValueError if the file changed on disk
+        since it was loaded, because the placements were made on the loaded version.
+        Returns the number of pages in the output PDF.
+        """
+        if not self.pdf_source:
+            raise ValueError("No PDF loaded.")
+        if not self.pdf_source.is_current():
+            raise ValueError(f"{self.pdf_source.path} changed on disk after it was loaded; open it again before signing.")
+        return self._sign(self.pdf_source, signature_path, output_pdf_path, signature_data, backend,
+                          progress_callback=progress_callback, signature_dpi=signature_dpi,
+                          signature_encoding=signature_encoding)
+
+    def load_signature(self, signature_path, target_size=None):
+        """Returns the cached SignatureAsset for a signature image file, decoding it on first use."""
+        return self.signature_cache.get(signature_path, target_size)
+
+    def load_signature_image(self, signature_path):
+        """Decodes a signature image file into the RGBA PIL.Image the stamping backends expect."""
+        return self.load_signature(signature_path).image
+
+    def add_signature_image_to_pdf(self, input_pdf_path, sig_img, output_pdf_path, signature_data, backend="pypdf2", incremental=False, progress_callback=None, streaming=False, signature_dpi=None, signature_encoding="flate"):
+        """
+        Same as add_signatures_to_pdf, but takes a SignatureAsset or an already decoded
+        PIL image, and input_pdf_path may also be an open PdfSource.
+        """
+        return self._sign(input_pdf_path, sig_img, output_pdf_path, signature_data, backend, incremental, progress_callback, streaming, signature_dpi, signature_encoding)
+
+    def _sign(self, input_pdf_path, signature, output_pdf_path, signature_data, backend="pypdf2", incremental=False, progress_callback=None, streaming=False, signature_dpi=None, signature_encoding="flate"):
+        """signature is a signature image path, a SignatureAsset or a decoded PIL image."""
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}. Use one of: {', '.join(BACKENDS)}")
+        if incremental and backend != "pymupdf":
+            raise ValueError("Incremental save requires the pymupdf backend.")
+        if streaming and backend != "pypdf2":
+            raise ValueError("Streaming output requires the pypdf2 backend.")
+        if signature_encoding not in SIGNATURE_ENCODINGS:
+            raise ValueError(f"Unknown signature encoding: {signature_encoding}. Use one of: {', '.join(SIGNATURE_ENCODINGS)}")
+        if signature_dpi is not None and signature_dpi <= 0:
+            raise ValueError("signature_dpi must be positive.")
+
+        with self.instrumentation.operation("add_signatures_to_pdf", backend=backend, incremental=incremental, streaming=streaming,
+                                            signature_dpi=signature_dpi, signature_encoding=signature_encoding,
+                                            output_pdf_path=output_pdf_path) as op:
+            with op.stage("parse"):
+                source, owned_source = self.open_source(input_pdf_path)
+            try:
+                op.fields['input_pdf_path'] = source.path
+                op.count('input_bytes', source.size)
+                with op.stage("image_prep"):
+                    if isinstance(signature, str):
+                        sig_img = self.load_signature(signature)
+                    elif isinstance(signature, SignatureAsset):
+                        sig_img = signature
+                    else:
+                        sig_img = SignatureAsset.from_image(signature)
+                return self._sign_source(source, sig_img, output_pdf_path, signature_data, backend, incremental,
+                                         progress_callback, streaming, signature_dpi, signature_encoding, op)
+            finally:
+                if owned_source:
+                    source.close()
+
+    def _sign_source(self, source, sig_img, output_pdf_path, signature_data, backend, incremental,
+                     progress_callback, streaming, signature_dpi, signature_encoding, op):
+        op.count('placements', len(signature_data))
+        # Before the output cache key is built from them, so a cached result is never returned for placements signing would reject
+        self._validate_placements(signature_data)
+        cache_key = None
+        # Images passed in decoded have no content digest to key on
+        if self.output_cache and sig_img.key:
+            with op.stage("cache_lookup"):
+                options = {
+                    'backend': backend, 'incremental': incremental, 'streaming': streaming,
+                    'signature_dpi': signature_dpi, 'signature_encoding': signature_encoding,
+                }
+                cache_key = self.output_cache.key_for(source, sig_img.key, signature_data, options)
+                page_count = self.output_cache.fetch(cache_key, output_pdf_path)
+            if page_count is not None:
+                op.count('output_cache_hits')
+                op.count('pages', page_count)
+                return page_count
+
+        if signature_dpi and signature_data:
+            with op.stage("image_prep"):
+                sig_img = sig_img.resampled(self._signature_pixel_size(signature_data, signature_dpi))
+
+        os.makedirs(os.path.dirname(output_pdf_path), exist_ok=True)
+        # Write next to the destination and move into place only once complete
+        partial_path = output_pdf_path + ".part"
+        try:
+            if backend == "pymupdf":
+                page_count = self._stamp_with_pymupdf(source, sig_img, partial_path, signature_data, incremental, progress_callback, signature_encoding, op)
+            elif streaming:
+                page_count = self._stamp_with_pypdf2_streaming(source, sig_img, partial_path, signature_data, progress_callback, signature_encoding, op)
+            else:
+                page_count = self._stamp_with_pypdf2(source, sig_img, partial_path, signature_data, progress_callback, signature_encoding, op)
+            with op.stage("write"):
+                op.count('bytes_written', os.path.getsize(partial_path))
+                os.replace(partial_path, output_pdf_path)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+        if cache_key:
+            with op.stage("write"):
+                self.output_cache.store(cache_key, output_pdf_path, page_count)
+        op.count('pages', page_count)
+        return page_count
+
+    def _signature_pixel_size(self, signature_data, dpi):
+        """Pixel size that gives dpi at the largest placement in signature_data."""
+        width_pts = max(sig['width'] for sig in signature_data)
+        height_pts = max(sig['height'] for sig in signature_data)
+        return (width_pts * dpi / 72, height_pts * dpi / 72)
+
+    def _validate_placements(self, signature_data):
+        """Rejects placements with a page number that is not a non-negative int or a
+        position or size that is not a number; the page count is checked later."""
+        for sig in signature_data:
+            page_num = sig['page_num']
+            # A negative index would otherwise mean a page from the end with pymupdf and no page at all with pypdf2
+            if not isinstance(page_num, int) or isinstance(page_num, bool) or page_num < 0:
+                raise ValueError(f"Page {page_num!r} does not exist in the PDF.")
+            for field in ('x', 'y', 'width', 'height'):
+                if not isinstance(sig[field], (int, float)) or isinstance(sig[field], bool):
+                    raise ValueError(f"Placement {field} must be a number, not {sig[field]!r}.")
+
+    def _group_signatures_by_page(self, signature_data, page_count):
+        """Groups signature dicts (checked by _validate_placements) by page number, validating against page_count."""
         signatures_by_page = {}
         for sig in signature_data:
             page_num = sig['page_num']
-            if page_num >= len(reader.pages):
-                raise ValueError(f"Page {page_num} does not exist in the PDF. Total pages: {len(reader.pages)}")
+            if page_num >= page_count:
+                raise ValueError(f"Page {page_num!r} does not exist in the PDF. Total pages: {page_count}")
             
             if page_num not in signatures_by_page:
                 signatures_by_page[page_num] = []
             signatures_by_page[page_num].append(sig)
+        return signatures_by_page
+
+    def _stamp_with_pypdf2(self, source, sig_img, output_pdf_path, signature_data, progress_callback, encoding, op):
+        from PyPDF2 import PdfWriter
+        with op.stage("parse"):
+            reader = source.open_reader()
+            page_count = len(reader.pages)
+        writer = PdfWriter()
         
-        for i in range(len(reader.pages)):
-            current_page = reader.pages[i]
+        signatures_by_page = self._group_signatures_by_page(signature_data, page_count)
+        op.count('pages_stamped', len(signatures_by_page))
+        
+        # One image XObject per output document, referenced by every signed page
+        sig_xobject = None
+        for i in range(page_count):
+            with op.stage("merge"):
+                page = writer.add_page(reader.pages[i])
             
             if i in signatures_by_page:
-                page_width = float(current_page.mediabox.width)
-                page_height = float(current_page.mediabox.height)
-                
-                signature_buffer = io.BytesIO()
-                signature_canvas = canvas.Canvas(signature_buffer, pagesize=(page_width, page_height))
-                
-                # Pre-save signature image to buffer to avoid saving multiple times
-                img_buffer = io.BytesIO()
-                sig_img.save(img_buffer, format='PNG')
-                
-                for sig in signatures_by_page[i]:
-                    img_buffer.seek(0)
-                    signature_canvas.drawImage(
-                        ImageReader(img_buffer),
-                        sig['x'], sig['y'],
-                        width=sig['width'],
-                        height=sig['height'],
-                        mask='auto'
-                    )
-                    
-                signature_canvas.save()
-                signature_buffer.seek(0)
-                
-                signature_reader = PdfReader(signature_buffer)
-                current_page.merge_page(signature_reader.pages[0])
+                if sig_xobject is None:
+                    sig_xobject = self._build_signature_xobject(writer, sig_img, encoding, op)
+                with op.stage("merge"):
+                    self._stamp_page(writer, page, sig_xobject, signatures_by_page[i])
             
-            writer.add_page(current_page)
+            if progress_callback:
+                progress_callback(i + 1, page_count)
         
-        os.makedirs(os.path.dirname(output_pdf_path), exist_ok=True)
-        with open(output_pdf_path, "wb") as output_file:
+        with op.stage("serialize"), open(output_pdf_path, "wb") as output_file:
             writer.write(output_file)
+        return page_count
+
+    def _stamp_with_pypdf2_streaming(self, source, sig_img, output_pdf_path, signature_data, progress_callback, encoding, op):
+        from streaming_writer import StreamingPdfWriter
+        # The reader parses objects on demand from the mapping, never loading the whole input
+        with open(output_pdf_path, "wb") as output_file:
+            with op.stage("parse"):
+                reader = source.open_reader()
+                writer = StreamingPdfWriter(output_file, reader)
+                page_count = len(reader.pages)
+
+            signatures_by_page = self._group_signatures_by_page(signature_data, page_count)
+            op.count('pages_stamped', len(signatures_by_page))
+
+            sig_xobject = None
+            for i in range(page_count):
+                page = reader.pages[i]
+                if i in signatures_by_page:
+                    if sig_xobject is None:
+                        sig_xobject = self._build_signature_xobject(writer, sig_img, encoding, op)
+                    with op.stage("merge"):
+                        self._stamp_page(writer, page, sig_xobject, signatures_by_page[i])
+                # Copying a page out also reads its objects from the input
+                with op.stage("serialize"):
+                    writer.add_page(page)
+
+                if progress_callback:
+                    progress_callback(i + 1, page_count)
+
+            with op.stage("serialize"):
+                writer.close()
+        return page_count
+
+    def _build_signature_xobject(self, writer, sig_img, encoding, op):
+        """Returns the image XObject of the SignatureAsset's overlay PDF copied into writer."""
+        from PyPDF2 import PdfReader
+        from streaming_writer import StreamingPdfWriter
+        with op.stage("image_prep"):
+            overlay_pdf = sig_img.overlay_pdf(encoding)
+        with op.stage("overlay_build"):
+            signature_page = PdfReader(io.BytesIO(overlay_pdf)).pages[0]
+            xobjects = signature_page['/Resources']['/XObject'].get_object()
+            image_ref = next(iter(xobjects.values()))
+            if isinstance(writer, StreamingPdfWriter):
+                return writer.import_object(image_ref)
+            return image_ref.clone(writer)
+
+    def _stamp_page(self, writer, page, sig_xobject, signatures):
+        """Draws sig_xobject at each placement on a page that already belongs to writer."""
+        from PyPDF2.generic import ArrayObject, DecodedStreamObject, DictionaryObject, NameObject
+        resources = DictionaryObject(page.get('/Resources', DictionaryObject()).get_object())
+        xobjects = DictionaryObject(resources.get('/XObject', DictionaryObject()).get_object())
+        
+        name = SIGNATURE_XOBJECT_NAME
+        suffix = 0
+        while name in xobjects and xobjects[name] != sig_xobject:
+            suffix += 1
+            name = f"{SIGNATURE_XOBJECT_NAME}{suffix}"
+        xobjects[NameObject(name)] = sig_xobject
+        resources[NameObject('/XObject')] = xobjects
+        page[NameObject('/Resources')] = resources
+        
+        # Clip to the page box like the merged overlay did, then paint each placement
+        page_width = float(page.mediabox.width)
+        page_height = float(page.mediabox.height)
+        operations = [f"q 0 0 {page_width:.4f} {page_height:.4f} re W n"]
+        for sig in signatures:
+            operations.append(
+                f"q {sig['width']:.4f} 0 0 {sig['height']:.4f} {sig['x']:.4f} {sig['y']:.4f} cm {name} Do Q"
+            )
+        operations.append("Q")
+        
+        # Isolate the original content so an unbalanced graphics state cannot move the signature
+        push_stream = DecodedStreamObject()
+        push_stream.set_data(b"q\n")
+        draw_stream = DecodedStreamObject()
+        draw_stream.set_data(("Q\n" + "\n".join(operations) + "\n").encode("ascii"))
+        
+        contents = ArrayObject([writer._add_object(push_stream)])
+        if '/Contents' in page:
+            # The raw entry: a single content stream must stay an indirect reference, never be inlined into the array
+            original_contents = page.raw_get('/Contents')
+            if isinstance(original_contents.get_object(), ArrayObject):
+                contents.extend(original_contents.get_object())
+            else:
+                contents.append(original_contents)
+        contents.append(writer._add_object(draw_stream))
+        page[NameObject('/Contents')] = contents
+
+    def _stamp_with_pymupdf(self, source, sig_img, output_pdf_path, signature_data, incremental, progress_callback, encoding, op):
+        import fitz
+        with op.stage("parse"):
+            if incremental:
+                # Appending to a copy keeps the original bytes as an untouched prefix of the output
+                source.write_to(output_pdf_path)
+                doc = fitz.open(output_pdf_path)
+            else:
+                doc = source.open_fitz()
+        
+        try:
+            if incremental and not doc.can_save_incrementally():
+                raise ValueError("This PDF cannot be updated incrementally (it is damaged or needs repair).")
+            
+            self._insert_signatures(doc, sig_img, signature_data, progress_callback, encoding, op)
+            
+            with op.stage("serialize"):
+                if incremental:
+                    doc.save(output_pdf_path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP, deflate_images=True)
+                else:
+                    doc.save(output_pdf_path, deflate_images=True)
+            return len(doc)
+        finally:
+            doc.close()
+
+    def _insert_signatures(self, doc, sig_img, signature_data, progress_callback, encoding, op):
+        """Inserts the SignatureAsset sig_img into an open fitz document at every placement in signature_data."""
+        import fitz
+        signatures_by_page = self._group_signatures_by_page(signature_data, len(doc))
+        op.count('pages_stamped', len(signatures_by_page))
+        with op.stage("image_prep"):
+            stream, mask = sig_img.image_streams(encoding)
+        
+        # The first insertion embeds the image, every later one references its xref
+        sig_xref = 0
+        for done, page_num in enumerate(sorted(signatures_by_page), start=1):
+            with op.stage("merge"):
+                page = doc[page_num]
+                for sig in signatures_by_page[page_num]:
+                    # signature_data is in PDF user space (bottom-left origin)
+                    pdf_rect = fitz.Rect(sig['x'], sig['y'], sig['x'] + sig['width'], sig['y'] + sig['height'])
+                    rect = pdf_rect * page.transformation_matrix
+                    if sig_xref:
+                        page.insert_image(rect, xref=sig_xref, keep_proportion=False)
+                    else:
+                        sig_xref = page.insert_image(rect, stream=stream, mask=mask, keep_proportion=False)
             
-        print(f"add_signatures_to_pdf took {time.time() - start_time:.2f} seconds")
+            if progress_callback:
+                progress_callback(done, len(signatures_by_page))
 
     def __del__(self):
-        if hasattr(self, 'pdf_doc') and self.pdf_doc:
-            self.pdf_doc.close()
\ No newline at end of file
+        if hasattr(self, 'pdf_source'):
+            self._close_pdf()
\ No newline at end of file
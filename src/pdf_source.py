@@ -0,0 +1,87 @@
+import os
+import mmap
+import hashlib
+
+class PdfSource:
+    """
+    A read-only memory map of an input PDF, shared by everything that reads
+    it during a job: the content hash, the fitz document used for rendering
+    or placement, and the PyPDF2 reader used for writing. The file is read
+    once, on demand, through the OS page cache instead of once per consumer,
+    and nothing is copied onto the Python heap.
+
+    Documents and readers opened from a source borrow its buffer, so close
+    them before closing the source. The file must not be modified while it
+    is mapped.
+    """
+
+    def __init__(self, pdf_path):
+        if not os.path.exists(pdf_path):
+            raise ValueError(f"Input PDF not found at: {pdf_path}")
+        self.path = os.path.abspath(pdf_path)
+        self._file = open(pdf_path, "rb")
+        try:
+            stat = os.fstat(self._file.fileno())
+            self.stat_key = (stat.st_mtime_ns, stat.st_size)  # identifies this version of the file
+            if stat.st_size == 0:
+                raise ValueError("PDF is empty.")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            # Parsers jump around the file; start one readahead of all of it instead of faulting page by page
+            if hasattr(mmap, "MADV_WILLNEED"):
+                self._mmap.madvise(mmap.MADV_WILLNEED)
+        except BaseException:
+            self._file.close()
+            raise
+        self._view = memoryview(self._mmap)
+        self._reader_maps = []
+        self._digest = None
+
+    @property
+    def size(self):
+        return self.stat_key[1]
+
+    def is_current(self):
+        """False once the file on disk was replaced or modified since it was mapped."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        return (stat.st_mtime_ns, stat.st_size) == self.stat_key
+
+    def open_fitz(self):
+        """Opens the mapped bytes as a fitz document without copying them."""
+        import fitz
+        return fitz.open(stream=self._view, filetype="pdf")
+
+    def open_reader(self):
+        """Returns a PdfReader over the mapped bytes that parses objects on demand."""
+        from PyPDF2 import PdfReader
+        # Every reader gets its own map object (and file position) over the same pages
+        reader_map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._reader_maps.append(reader_map)
+        return PdfReader(reader_map)
+
+    def digest(self):
+        """SHA-256 of the file content."""
+        if self._digest is None:
+            self._digest = hashlib.sha256(self._view).hexdigest()
+        return self._digest
+
+    def write_to(self, output_path):
+        with open(output_path, "wb") as f:
+            f.write(self._view)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._view.release()
+        for reader_map in self._reader_maps:
+            reader_map.close()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,181 @@
+"""
+Asyncio signing pipeline that overlaps reading and writing files with signing.
+
+sign_batch signs each input where it lies and writes each output straight
+to its destination, so on a network share its workers wait for the share
+while they parse and merge. Here every job passes through three stages
+connected by bounded queues:
+
+    read    copies the input PDF into a local staging folder (I/O threads)
+    sign    signs the staged copy on the batch workers (see batch.py), which
+            memory-map a local file instead of faulting pages in over the network
+    write   copies the signed PDF to a .part file next to its destination and
+            moves it into place (I/O threads)
+
+Each stage works on its own number of jobs at once. A stage whose output
+queue is full waits, so at most readers + workers + writers + 2 * queue_size
+jobs are staged locally at any time, however long the batch is. With enough
+readers and writers, a batch takes about as long as its slowest stage rather
+than the sum of all three.
+"""
+
+import os
+import time
+import shutil
+import asyncio
+import tempfile
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import batch
+from instrumentation import Instrumentation
+
+DEFAULT_READERS = 4
+DEFAULT_WRITERS = 4
+
+def _copy_file(source_path, destination_path):
+    shutil.copyfile(source_path, destination_path)
+
+def _stage_input(input_pdf_path, staged_path):
+    os.makedirs(os.path.dirname(staged_path), exist_ok=True)
+    _copy_file(input_pdf_path, staged_path)
+
+def _publish_output(staged_path, output_pdf_path):
+    directory = os.path.dirname(output_pdf_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Readers of the destination never see a half-copied file
+    partial_path = output_pdf_path + ".part"
+    try:
+        _copy_file(staged_path, partial_path)
+        os.replace(partial_path, output_pdf_path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+def _failed(job, error, stages):
+    return {'input_pdf_path': job['input_pdf_path'], 'output_pdf_path': job['output_pdf_path'], 'pages': 0, 'cached': False,
+            'seconds': sum(stages.values()), 'error': error, 'stages': dict(stages), 'counters': {}}
+
+async def sign_pipeline(jobs, readers=DEFAULT_READERS, workers=None, writers=DEFAULT_WRITERS, queue_size=None, staging_dir=None,
+                        backend="pypdf2", incremental=False, on_result=None, streaming=False, signature_cache_dir=None,
+                        signature_dpi=None, signature_encoding="flate", output_cache_dir=None, profiler=None, profile_dir=None):
+    """
+    Signs jobs like batch.sign_batch and returns one result dict per job, in
+    job order, with the same keys; 'stages' also holds 'read_input' and
+    'write_output', the seconds spent copying the job's files.
+
+    readers, workers, writers: jobs copied in, signed and copied out at once.
+        workers defaults to os.cpu_count(); 1 signs in a thread of this process.
+    queue_size: jobs that may wait between two stages (defaults to workers).
+    staging_dir: local folder for the staged copies (defaults to the temp folder).
+    on_result: optional callable invoked with each result as its job finishes,
+        which is not necessarily job order.
+    The remaining arguments are those of batch.sign_batch.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    for name, value in (('readers', readers), ('workers', workers), ('writers', writers)):
+        if value < 1:
+            raise ValueError(f"{name} must be at least 1.")
+    if queue_size is None:
+        queue_size = workers
+    if queue_size < 1:
+        raise ValueError("queue_size must be at least 1.")
+    if profiler:
+        # Reject an unknown or missing profiler here rather than in every worker
+        Instrumentation(profiler=profiler)
+
+    options = {
+        'backend': backend,
+        'incremental': incremental,
+        'streaming': streaming,
+        'signature_dpi': signature_dpi,
+        'signature_encoding': signature_encoding,
+    }
+    initargs = (sorted({job['signature_path'] for job in jobs}), signature_cache_dir, output_cache_dir, profiler, profile_dir)
+    if workers == 1:
+        sign_executor = ThreadPoolExecutor(1, thread_name_prefix="pipeline-sign", initializer=batch._init_worker, initargs=initargs)
+    else:
+        # Spawned rather than forked: the event loop's I/O threads are already running
+        sign_executor = batch.WorkerPool(workers, initargs, mp_context=multiprocessing.get_context("spawn"))
+
+    loop = asyncio.get_running_loop()
+    results = [None] * len(jobs)
+    pending = iter(enumerate(jobs))
+    to_sign = asyncio.Queue(queue_size)
+    to_write = asyncio.Queue(queue_size)
+
+    def sign(staged):
+        if workers == 1:
+            return loop.run_in_executor(sign_executor, batch._sign_job, staged, options)
+        # A worker dying fails only its own job (see batch.WorkerPool), never the jobs after it
+        return asyncio.wrap_future(sign_executor.submit(staged, options))
+
+    def finish(index, result, job_dir):
+        shutil.rmtree(job_dir, ignore_errors=True)
+        results[index] = result
+        if on_result:
+            on_result(result)
+
+    async def read_stage():
+        # Readers share one iterator, so each takes the next job not yet started
+        for index, job in pending:
+            job_dir = os.path.join(staging, str(index))
+            staged = dict(job, input_pdf_path=os.path.join(job_dir, "input.pdf"), output_pdf_path=os.path.join(job_dir, "output.pdf"))
+            start = time.perf_counter()
+            try:
+                await loop.run_in_executor(read_pool, _stage_input, job['input_pdf_path'], staged['input_pdf_path'])
+            except OSError as e:
+                error = f"Input PDF not found at: {job['input_pdf_path']}" if isinstance(e, FileNotFoundError) else f"Could not read the input: {e}"
+                finish(index, _failed(job, error, {'read_input': time.perf_counter() - start}), job_dir)
+                continue
+            await to_sign.put((index, job, staged, {'read_input': time.perf_counter() - start}))
+
+    async def sign_stage():
+        while (item := await to_sign.get()) is not None:
+            index, job, staged, stages = item
+            job_dir = os.path.dirname(staged['input_pdf_path'])
+            result = await sign(staged)
+            result['input_pdf_path'], result['output_pdf_path'] = job['input_pdf_path'], job['output_pdf_path']
+            result['stages'] = dict(stages, **result['stages'])
+            if result['error']:
+                result['seconds'] += stages['read_input']
+                finish(index, result, job_dir)
+                continue
+            await to_write.put((index, staged, result))
+
+    async def write_stage():
+        while (item := await to_write.get()) is not None:
+            index, staged, result = item
+            start = time.perf_counter()
+            try:
+                await loop.run_in_executor(write_pool, _publish_output, staged['output_pdf_path'], result['output_pdf_path'])
+            except OSError as e:
+                result['error'] = f"Could not write the output: {e}"
+                result['pages'] = 0
+            result['stages']['write_output'] = time.perf_counter() - start
+            result['seconds'] += result['stages']['read_input'] + result['stages']['write_output']
+            finish(index, result, os.path.dirname(staged['input_pdf_path']))
+
+    async def run_stage(stage, count, next_queue, consumers):
+        await asyncio.gather(*(stage() for _ in range(count)))
+        # One end marker for every task of the next stage
+        for _ in range(consumers):
+            await next_queue.put(None)
+
+    with tempfile.TemporaryDirectory(prefix="sign-pipeline-", dir=staging_dir) as staging, \
+         ThreadPoolExecutor(readers, thread_name_prefix="pipeline-read") as read_pool, \
+         ThreadPoolExecutor(writers, thread_name_prefix="pipeline-write") as write_pool, \
+         sign_executor:
+        await asyncio.gather(
+            run_stage(read_stage, readers, to_sign, workers),
+            run_stage(sign_stage, workers, to_write, writers),
+            *(write_stage() for _ in range(writers)),
+        )
+    return results
+
+def run_pipeline(jobs, **options):
+    """Runs sign_pipeline to completion from synchronous code; see sign_pipeline for the options."""
+    return asyncio.run(sign_pipeline(jobs, **options))
@@ -0,0 +1,121 @@
+import re
+
+DEFAULT_ANCHOR_PATTERNS = (r"Signature\s*:", r"Signed by")
+ANCHOR_POSITIONS = ("right", "above", "below")
+ANCHOR_GAP_PTS = 4.0  # space left between the anchor text and the signature
+
+class TextIndex:
+    """
+    Text lines of an open fitz document, extracted once per page on first
+    search so any number of anchor patterns reuse the same extraction.
+    Each line is (text, words) where words are (start, end, fitz.Rect) with
+    start/end the word's character span in text.
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._lines = {}  # page_num: list of lines
+
+    def lines(self, page_num):
+        lines = self._lines.get(page_num)
+        if lines is None:
+            lines = self._extract_lines(self.doc[page_num])
+            self._lines[page_num] = lines
+        return lines
+
+    def search(self, page_num, pattern):
+        """Returns the fitz.Rect (page coordinates, top-left origin) of every match of the compiled pattern."""
+        matches = []
+        for text, words in self.lines(page_num):
+            for match in pattern.finditer(text):
+                if match.end() > match.start():
+                    matches.append(self._span_rect(words, match.start(), match.end()))
+        return matches
+
+    @staticmethod
+    def _extract_lines(page):
+        import fitz
+        grouped = {}
+        for x0, y0, x1, y1, word, block_no, line_no, _ in page.get_text("words", sort=True):
+            grouped.setdefault((block_no, line_no), []).append((word, fitz.Rect(x0, y0, x1, y1)))
+
+        lines = []
+        for line_words in grouped.values():
+            text_parts = []
+            words = []
+            position = 0
+            for word, rect in line_words:
+                words.append((position, position + len(word), rect))
+                text_parts.append(word)
+                position += len(word) + 1
+            lines.append((" ".join(text_parts), words))
+        return lines
+
+    @staticmethod
+    def _span_rect(words, start, end):
+        import fitz
+        rect = fitz.Rect()
+        for word_start, word_end, word_rect in words:
+            if word_end <= start or word_start >= end:
+                continue
+            # Match boundaries inside a word are interpolated from its width
+            length = max(word_end - word_start, 1)
+            left = word_rect.x0 + word_rect.width * max(start - word_start, 0) / length
+            right = word_rect.x0 + word_rect.width * (min(end, word_end) - word_start) / length
+            part = fitz.Rect(left, word_rect.y0, right, word_rect.y1)
+            rect = part if rect.is_empty else rect | part
+        return rect
+
+def find_anchor_placements(doc, width, height, patterns=DEFAULT_ANCHOR_PATTERNS, position="right",
+                           offset=(0.0, 0.0), pages=None, ignore_case=True, text_index=None):
+    """
+    Searches the pages of an open fitz document for anchor text and returns
+    signature_data placements (PDF points, bottom-left origin) of width x height
+    next to every match.
+
+    patterns: regular expressions; use re.escape for literal text.
+    position: "right" of the anchor sharing its baseline, or "above"/"below" it, left-aligned.
+    offset: (dx, dy) in points added to each placement, dy pointing up.
+    pages: 0-indexed page numbers to search (defaults to every page).
+    text_index: a TextIndex for doc to reuse across calls.
+    """
+    import fitz
+    if position not in ANCHOR_POSITIONS:
+        raise ValueError(f"Unknown anchor position: {position}. Use one of: {', '.join(ANCHOR_POSITIONS)}")
+    flags = re.IGNORECASE if ignore_case else 0
+    try:
+        compiled = [re.compile(pattern, flags) for pattern in patterns]
+    except re.error as e:
+        raise ValueError(f"Invalid anchor pattern: {e}")
+    if text_index is None:
+        text_index = TextIndex(doc)
+    page_nums = range(len(doc)) if pages is None else [p for p in pages if 0 <= p < len(doc)]
+
+    placements = []
+    for page_num in page_nums:
+        to_pdf = ~doc[page_num].transformation_matrix
+        anchors = []
+        for pattern in compiled:
+            anchors.extend(text_index.search(page_num, pattern))
+        # Several patterns can match the same text; sign each spot once
+        seen = set()
+        for anchor in sorted(anchors, key=lambda r: (r.y0, r.x0)):
+            if position == "right":
+                box = fitz.Rect(anchor.x1 + ANCHOR_GAP_PTS, anchor.y1 - height, anchor.x1 + ANCHOR_GAP_PTS + width, anchor.y1)
+            elif position == "above":
+                box = fitz.Rect(anchor.x0, anchor.y0 - height, anchor.x0 + width, anchor.y0)
+            else:
+                box = fitz.Rect(anchor.x0, anchor.y1, anchor.x0 + width, anchor.y1 + height)
+            pdf_box = box * to_pdf
+            key = (round(pdf_box.x0, 1), round(pdf_box.y0, 1))
+            if key in seen:
+                continue
+            seen.add(key)
+            placements.append({
+                'page_num': page_num,
+                'x': pdf_box.x0 + offset[0],
+                'y': pdf_box.y0 + offset[1],
+                'width': float(width),
+                'height': float(height),
+            })
+    return placements
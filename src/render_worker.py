@@ -0,0 +1,126 @@
+import threading
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from pdf_processor import DEFAULT_DPI, PREVIEW_DPI
+
+def pixmap_to_qimage(pix):
+    """Wraps an RGB fitz.Pixmap's sample buffer in a QImage without copying it."""
+    qimage = QImage(pix.samples_mv, pix.width, pix.height, pix.stride, QImage.Format.Format_RGB888)
+    # The QImage only borrows the buffer, so it has to keep the pixmap alive
+    qimage._fitz_pixmap = pix
+    return qimage
+
+def tile_format(col, row):
+    """Page cache image_format under which the (col, row) deep-zoom tile is stored."""
+    return f"qtile_{col}_{row}"
+
+class PageRenderWorker(QThread):
+    """
+    Renders pages on a dedicated thread with its own fitz document handle.
+    The requested page is rendered first as a low-DPI preview, then at the
+    requested DPI, then the next/previous prefetch_count pages follow,
+    all into the PDFProcessor's shared page cache as "qimage" entries.
+    Tiles of the visible region at deep zoom take priority over whole pages.
+    """
+    page_rendered = pyqtSignal(str, int, object)  # pdf_path, page_num, (QImage, width_pts, height_pts, dpi_scale)
+    tile_rendered = pyqtSignal(str, int, int, int, int, object)  # pdf_path, page_num, dpi, col, row, QImage
+    render_failed = pyqtSignal(str, int, str)  # pdf_path, page_num, error message
+
+    def __init__(self, pdf_processor, prefetch_count=2, parent=None):
+        super().__init__(parent)
+        self.pdf_processor = pdf_processor
+        self.prefetch_count = prefetch_count
+        self._condition = threading.Condition()
+        self._pdf_path = None
+        self._page_count = 0
+        self._generation = 0
+        self._queue = []
+        self._tile_queue = []
+        self._stopping = False
+
+    def set_document(self, pdf_path, page_count):
+        """Switches to a new PDF and drops all pending requests for the old one."""
+        with self._condition:
+            self._pdf_path = pdf_path
+            self._page_count = page_count
+            self._generation += 1
+            self._queue = []
+            self._tile_queue = []
+            self._condition.notify()
+
+    def request_page(self, page_num, dpi=DEFAULT_DPI, preview_dpi=PREVIEW_DPI):
+        """Queues page_num and its neighbours, replacing any older requests."""
+        pages = [page_num]
+        for offset in range(1, self.prefetch_count + 1):
+            pages.extend([page_num + offset, page_num - offset])
+        # Entries are (page_num, dpi to render, dpi that makes this entry unnecessary once cached)
+        order = [(p, dpi, dpi) for p in pages]
+        if preview_dpi and preview_dpi < dpi:
+            order.insert(0, (page_num, preview_dpi, dpi))
+        with self._condition:
+            self._queue = [entry for entry in order if 0 <= entry[0] < self._page_count]
+            self._condition.notify()
+
+    def request_tiles(self, page_num, dpi, tiles):
+        """Queues (col, row) tiles of page_num at dpi ahead of page renders,
+        replacing tiles requested for an earlier viewport."""
+        with self._condition:
+            self._tile_queue = [(page_num, dpi, col, row) for col, row in tiles]
+            self._condition.notify()
+
+    def stop(self):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self.wait()
+
+    def run(self):
+        doc = None
+        doc_generation = None
+        while True:
+            with self._condition:
+                while not self._stopping and not self._queue and not self._tile_queue:
+                    self._condition.wait()
+                if self._stopping:
+                    break
+                pdf_path = self._pdf_path
+                generation = self._generation
+                if self._tile_queue:
+                    page_num, dpi, col, row = self._tile_queue.pop(0)
+                    cache_format = tile_format(col, row)
+                    final_dpi = dpi
+                else:
+                    page_num, dpi, final_dpi = self._queue.pop(0)
+                    cache_format = "qimage"
+
+            # A preview is pointless once the sharp render is already there
+            if self.pdf_processor.is_page_cached(page_num, pdf_path, final_dpi, cache_format) or \
+                    self.pdf_processor.is_page_cached(page_num, pdf_path, dpi, cache_format):
+                continue
+
+            try:
+                # Reopen on every set_document, even for the same path, in case the file changed
+                if doc_generation != generation:
+                    if doc:
+                        doc.close()
+                        doc = None
+                    import fitz
+                    doc = fitz.open(pdf_path)
+                    doc_generation = generation
+                if cache_format != "qimage":
+                    pix, width, height, dpi_scale = self.pdf_processor.render_tile_pixmap(doc, page_num, dpi, col, row)
+                    result = (pixmap_to_qimage(pix), width, height, dpi_scale)
+                    self.pdf_processor.cache_page_image(page_num, pdf_path, result, dpi, cache_format)
+                    self.tile_rendered.emit(pdf_path, page_num, dpi, col, row, result[0])
+                else:
+                    # In bands, so a dense page does not hold the GIL, and freeze the GUI, for its whole render
+                    pix, width, height, dpi_scale = self.pdf_processor.render_banded_pixmap(doc, page_num, dpi)
+                    result = (pixmap_to_qimage(pix), width, height, dpi_scale)
+                    self.pdf_processor.cache_page_image(page_num, pdf_path, result, dpi, "qimage")
+                    self.page_rendered.emit(pdf_path, page_num, result)
+            except Exception as e:
+                self.render_failed.emit(pdf_path, page_num, str(e))
+
+        if doc:
+            doc.close()
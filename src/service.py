@@ -0,0 +1,404 @@
+"""
+Local HTTP signing service backed by a pool of warm worker processes.
+
+Each worker is set up once, the way batch signing sets up its workers: it
+gets its own PDFProcessor and decodes the served signature images once.
+It then signs a blank page so the PDF libraries are imported and
+initialised. A request only pays for parsing and writing its own PDF.
+
+Requests (the server listens on 127.0.0.1 only):
+
+    POST /sign?signature=NAME
+        Body: the PDF (Content-Length required)
+        X-Signature-Data: placements as JSON, in the signature_data shape
+            add_signatures_to_pdf accepts, e.g.
+            [{"page_num": 0, "x": 72, "y": 72, "width": 150, "height": 60}]
+        NAME is the file name, without extension, of one of the --signature
+        images; it may be left out when the service serves only one.
+
+        200: the signed PDF, with X-Pages, X-Cached, X-Signing-Seconds and
+             X-Signing-Stages (JSON seconds per stage, see instrumentation.py)
+        400: malformed request, 413: PDF over --max-upload-mb,
+        422: the PDF could not be signed, 503: signing it crashed a worker
+        process again when retried alone; error responses are {"error": "..."}
+
+        A crashed worker takes down the requests queued or running beside it
+        in the pool. The pool is restarted and each of those requests is
+        retried once alone in a separate worker, so only the request that
+        crashed it fails.
+
+    GET /health
+        {"status": "ok", "workers": N, "signatures": [...], "requests": N, "failures": N}
+
+Usage: python -m src.service --signature signature.png [--signature other.png] [--port 8765] [--workers N]
+       [--backend pymupdf] [--signature-dpi 300] [--signature-encoding jpeg] [--signature-cache DIR]
+       [--output-cache DIR] [--work-dir DIR] [--max-upload-mb 256]
+"""
+
+import os
+import sys
+import json
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+import multiprocessing
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Allow both `python -m src.service` and `python src/service.py` to find the sibling modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import batch
+from pdf_processor import BACKENDS
+from signature_cache import SIGNATURE_ENCODINGS
+from utils import normalize_placement
+
+logger = logging.getLogger(__name__)
+
+HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_UPLOAD_MB = 256
+COPY_CHUNK_SIZE = 1024 * 1024
+WORKER_START_TIMEOUT = 120  # seconds for every worker to finish its warm-up
+
+# Per-process state, set up by _init_service_worker
+_worker_barrier = None
+
+def _init_service_worker(barrier, signature_paths, options, signature_cache_dir, output_cache_dir):
+    global _worker_barrier
+    _worker_barrier = barrier
+    batch._init_worker(signature_paths, signature_cache_dir, output_cache_dir)
+    # Sign a blank page with every signature, so the first request finds the PDF libraries
+    # imported and the signature encoded; the warm-up output stays out of the output cache
+    import fitz
+    processor = batch._worker_processor
+    output_cache, processor.output_cache = processor.output_cache, None
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            blank_path = os.path.join(tmp_dir, "blank.pdf")
+            doc = fitz.open()
+            doc.new_page()
+            doc.save(blank_path)
+            doc.close()
+            placement = [{'page_num': 0, 'x': 72.0, 'y': 72.0, 'width': 150.0, 'height': 60.0}]
+            for signature_path in signature_paths:
+                signature = batch._worker_signatures[signature_path]
+                if not isinstance(signature, Exception):
+                    processor.add_signature_image_to_pdf(blank_path, signature, os.path.join(tmp_dir, "signed.pdf"), placement, **options)
+    finally:
+        processor.output_cache = output_cache
+
+def _worker_ready():
+    # Every worker blocks here until all have arrived, so each one takes exactly one of these tasks
+    _worker_barrier.wait(WORKER_START_TIMEOUT)
+    return os.getpid()
+
+class SigningService:
+    """
+    Signs uploaded PDFs on a pool of worker processes kept warm between requests.
+
+    signatures: {name: image path} of the signatures the service stamps.
+    options: keyword arguments for add_signatures_to_pdf (backend, signature_dpi, ...).
+    work_dir: where uploads and outputs are kept while a request runs.
+    """
+
+    def __init__(self, signatures, workers=None, options=None, signature_cache_dir=None, output_cache_dir=None, work_dir=None):
+        if not signatures:
+            raise ValueError("The service needs at least one signature image.")
+        for path in signatures.values():
+            if not os.path.exists(path):
+                raise ValueError(f"Signature image not found at: {path}")
+        self.signatures = dict(signatures)
+        self.workers = workers or os.cpu_count() or 1
+        if self.workers < 1:
+            raise ValueError("workers must be at least 1.")
+        self.options = dict(options or {})
+        self.signature_cache_dir = signature_cache_dir
+        self.output_cache_dir = output_cache_dir
+        self.work_dir = work_dir
+        if work_dir:
+            os.makedirs(work_dir, exist_ok=True)
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        # Held while a new pool warms up, so requests can still read the state guarded by _lock
+        self._restart_lock = threading.Lock()
+        self._executor = None
+        # One worker that retries, one at a time, the requests caught in a crash; see _sign_alone
+        self._quarantine_lock = threading.Lock()
+        self._quarantine = None
+        self._quarantined = 0
+
+    def start(self):
+        """Starts the worker processes and waits until every one of them is warm."""
+        executor = self._start_pool(self.workers)
+        with self._lock:
+            self._executor = executor
+
+    def _start_pool(self, workers):
+        # Spawned rather than forked: the pool is restarted from a process that is already serving on many threads
+        context = multiprocessing.get_context("spawn")
+        barrier = context.Barrier(workers)
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_service_worker,
+            initargs=(barrier, sorted(self.signatures.values()), self.options, self.signature_cache_dir, self.output_cache_dir),
+        )
+        futures = [executor.submit(_worker_ready) for _ in range(workers)]
+        pids = sorted(future.result() for future in futures)
+        logger.info("%d signing workers ready (pids %s)", workers, ", ".join(map(str, pids)))
+        return executor
+
+    def _restart_pool(self, broken):
+        """Replaces the broken executor, unless another request already did; returns the current one."""
+        with self._restart_lock:
+            with self._lock:
+                if self._executor is not broken:
+                    return self._executor
+            logger.error("A signing worker died, restarting the pool")
+            broken.shutdown(wait=False)
+            executor = self._start_pool(self.workers)
+            with self._lock:
+                self._executor = executor
+            return executor
+
+    def _sign_alone(self, job):
+        """
+        Signs job with nothing else running beside it, so a job that crashes
+        the worker again is the one that crashed the pool and fails alone.
+        The quarantine worker is started on demand and stopped once no
+        request is waiting for it.
+        """
+        with self._lock:
+            self._quarantined += 1
+        with self._quarantine_lock:
+            try:
+                if self._quarantine is None:
+                    self._quarantine = self._start_pool(1)
+                return self._quarantine.submit(batch._sign_job, job, self.options).result()
+            except BrokenProcessPool as e:
+                logger.error("A signing worker died on %s", job['input_pdf_path'])
+                self._quarantine.shutdown(wait=False)
+                self._quarantine = None
+                return {'pages': 0, 'cached': False, 'error': f"Worker failed: {e}", 'worker_failed': True, 'stages': {}, 'counters': {}}
+            finally:
+                with self._lock:
+                    self._quarantined -= 1
+                    idle = not self._quarantined
+                if idle and self._quarantine is not None:
+                    self._quarantine.shutdown()
+                    self._quarantine = None
+
+    def stop(self):
+        with self._lock:
+            if self._executor:
+                self._executor.shutdown()
+                self._executor = None
+
+    def signature_path(self, name):
+        """Returns the image path of the signature called name, or of the only signature when name is empty."""
+        if not name:
+            if len(self.signatures) > 1:
+                raise ValueError(f"Choose a signature with ?signature=NAME, one of: {', '.join(sorted(self.signatures))}")
+            return next(iter(self.signatures.values()))
+        if name not in self.signatures:
+            raise ValueError(f"Unknown signature: {name}. Use one of: {', '.join(sorted(self.signatures))}")
+        return self.signatures[name]
+
+    def sign(self, job):
+        """Signs a job dict (see batch.sign_batch) on a warm worker and returns its result dict."""
+        with self._lock:
+            executor = self._executor
+            self.requests += 1
+        try:
+            future = executor.submit(batch._sign_job, job, self.options)
+        except BrokenProcessPool:
+            # A worker died between requests; this job had nothing to do with it
+            executor = self._restart_pool(executor)
+            future = executor.submit(batch._sign_job, job, self.options)
+        try:
+            result = future.result()
+        except BrokenProcessPool:
+            # A worker died (e.g. crashed inside a native library) while this job was queued or
+            # running, but not necessarily on it: only a job that crashes again alone fails
+            self._restart_pool(executor)
+            result = self._sign_alone(job)
+        if result['error']:
+            with self._lock:
+                self.failures += 1
+        return result
+
+    def health(self):
+        with self._lock:
+            return {'status': 'ok', 'workers': self.workers, 'signatures': sorted(self.signatures),
+                    'requests': self.requests, 'failures': self.failures}
+
+class SigningRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so a client sending one document after another reuses its connection
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if urlsplit(self.path).path == "/health":
+            self._send_json(200, self.server.service.health())
+        else:
+            self._send_json(404, {'error': f"Not found: {self.path}"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/sign":
+            self.close_connection = True
+            self._send_json(404, {'error': f"Not found: {self.path}"})
+            return
+        service = self.server.service
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            self.close_connection = True
+            self._send_json(411, {'error': "Send the PDF with a Content-Length."})
+            return
+        if length > self.server.max_upload_bytes:
+            self.close_connection = True
+            self._send_json(413, {'error': f"The PDF is larger than {self.server.max_upload_bytes // (1024 * 1024)} MB."})
+            return
+
+        request_dir = tempfile.mkdtemp(prefix="sign-", dir=service.work_dir)
+        try:
+            # Read the whole body first, so the connection stays usable even when the request is rejected
+            input_path = os.path.join(request_dir, "input.pdf")
+            try:
+                self._receive(input_path, length)
+            except ConnectionError as e:
+                logger.info("%s %s", self.address_string(), e)
+                self.close_connection = True
+                return
+            try:
+                query = parse_qs(url.query)
+                signature_path = service.signature_path(query.get('signature', [''])[0])
+                signature_data = self._signature_data()
+            except ValueError as e:
+                self._send_json(400, {'error': str(e)})
+                return
+
+            output_path = os.path.join(request_dir, "signed.pdf")
+            job = {'input_pdf_path': input_path, 'output_pdf_path': output_path,
+                   'signature_path': signature_path, 'signature_data': signature_data}
+            result = service.sign(job)
+            if result['error']:
+                self._send_json(503 if result.get('worker_failed') else 422, {'error': result['error']})
+                return
+            self._send_file(output_path, {
+                'X-Pages': str(result['pages']),
+                'X-Cached': "true" if result['cached'] else "false",
+                'X-Signing-Seconds': f"{result['seconds']:.4f}",
+                'X-Signing-Stages': json.dumps({stage: round(seconds, 4) for stage, seconds in result['stages'].items()}),
+            })
+        finally:
+            shutil.rmtree(request_dir, ignore_errors=True)
+
+    def _signature_data(self):
+        header = self.headers.get('X-Signature-Data')
+        if not header:
+            raise ValueError("Give the placements in an X-Signature-Data header.")
+        try:
+            placements = json.loads(header)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"X-Signature-Data is not valid JSON: {e}")
+        if not isinstance(placements, list) or not placements:
+            raise ValueError("X-Signature-Data must be a non-empty list of placements.")
+        return [normalize_placement(placement, "X-Signature-Data") for placement in placements]
+
+    def _receive(self, path, length):
+        with open(path, 'wb') as f:
+            remaining = length
+            while remaining:
+                chunk = self.rfile.read(min(COPY_CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise ConnectionError("The client closed the connection before sending the whole PDF.")
+                f.write(chunk)
+                remaining -= len(chunk)
+
+    def _send_file(self, path, headers):
+        self.send_response(200)
+        self.send_header('Content-Type', "application/pdf")
+        self.send_header('Content-Length', str(os.path.getsize(path)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        with open(path, 'rb') as f:
+            shutil.copyfileobj(f, self.wfile, COPY_CHUNK_SIZE)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', "application/json")
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.info("%s %s", self.address_string(), format % args)
+
+def make_server(service, port=DEFAULT_PORT, max_upload_mb=DEFAULT_MAX_UPLOAD_MB):
+    """Returns an HTTP server on 127.0.0.1:port that signs with service (port 0 picks a free port)."""
+    server = ThreadingHTTPServer((HOST, port), SigningRequestHandler)
+    server.service = service
+    server.max_upload_bytes = int(max_upload_mb * 1024 * 1024)
+    return server
+
+def parse_signatures(paths):
+    """Maps each signature image's file name without extension to its path."""
+    signatures = {}
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        if name in signatures:
+            raise ValueError(f"Two signatures are named {name}; rename one of the files.")
+        signatures[name] = os.path.abspath(path)
+    return signatures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve PDF signing over HTTP on localhost.")
+    parser.add_argument('--signature', action='append', required=True, metavar='IMAGE', help="Signature image to serve (repeat for several)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port on 127.0.0.1")
+    parser.add_argument('--workers', type=int, default=0, help="Number of worker processes (0 = one per CPU core)")
+    parser.add_argument('--backend', choices=BACKENDS, default="pymupdf", help="Stamping backend")
+    parser.add_argument('--signature-dpi', type=float, help="Downsample signatures to this resolution at their placed size")
+    parser.add_argument('--signature-encoding', choices=SIGNATURE_ENCODINGS, default="flate", help="How the signature image is compressed")
+    parser.add_argument('--signature-cache', metavar='DIR', help="Persist prepared signature images here and reuse them across restarts")
+    parser.add_argument('--output-cache', metavar='DIR', help="Answer repeated identical requests from outputs stored here")
+    parser.add_argument('--work-dir', metavar='DIR', help="Keep uploads and outputs here while they are signed (default: the temp folder)")
+    parser.add_argument('--max-upload-mb', type=float, default=DEFAULT_MAX_UPLOAD_MB, help="Largest PDF accepted")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(format="%(asctime)s %(message)s", level=logging.INFO)
+    try:
+        service = SigningService(
+            parse_signatures(args.signature),
+            workers=args.workers or None,
+            options={'backend': args.backend, 'signature_dpi': args.signature_dpi, 'signature_encoding': args.signature_encoding},
+            signature_cache_dir=args.signature_cache,
+            output_cache_dir=args.output_cache,
+            work_dir=args.work_dir,
+        )
+    except ValueError as e:
+        print(f"✗ {e}")
+        return 2
+
+    service.start()
+    server = make_server(service, args.port, args.max_upload_mb)
+    print(f"Signing service on http://{HOST}:{server.server_port} with {service.workers} workers; Ctrl+C stops it")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+import os
+import io
+import math
+import hashlib
+import threading
+from collections import OrderedDict
+
+SIGNATURE_ENCODINGS = ("flate", "jpeg")
+DEFAULT_JPEG_QUALITY = 90
+
+class SignatureAsset:
+    """
+    A signature image prepared for stamping: the decoded RGBA image plus the
+    encoded forms the backends embed (image streams for pymupdf, a one-image
+    overlay PDF for pypdf2). Each form is produced at most once, and read
+    from cache_dir instead when a previous run persisted it there.
+
+    Encodings:
+        "flate": lossless RGB with a Flate-compressed soft mask.
+        "jpeg": DCT-compressed RGB with a separate lossless soft mask, much
+            smaller for photographed or scanned signatures.
+    """
+
+    def __init__(self, key, image=None, cache_dir=None):
+        self.key = key
+        self.cache_dir = cache_dir
+        self._image = image
+        self._premultiplied = None
+        self._encoded = {}  # file suffix: bytes
+        self._variants = {}  # target_size: SignatureAsset
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_image(cls, image):
+        """Wraps an already decoded PIL image that is not backed by a cached file."""
+        return cls(None, image.convert("RGBA"))
+
+    @property
+    def image(self):
+        """RGBA PIL.Image with straight alpha, as PDF soft masks expect."""
+        if self._image is None:
+            from PIL import Image
+            self._image = Image.open(io.BytesIO(self.png_bytes)).convert("RGBA")
+        return self._image
+
+    @property
+    def premultiplied(self):
+        """The image as premultiplied "RGBa", which Qt can paint without converting."""
+        if self._premultiplied is None:
+            self._premultiplied = self.image.convert("RGBa")
+        return self._premultiplied
+
+    @property
+    def png_bytes(self):
+        return self._encoded_form(".png", self._encode_png)
+
+    def image_streams(self, encoding="flate", jpeg_quality=DEFAULT_JPEG_QUALITY):
+        """Returns (stream, mask) for fitz insert_image; mask is None when stream carries its own alpha."""
+        if encoding == "jpeg":
+            jpeg = self._encoded_form(f".q{jpeg_quality}.jpg", lambda: self._encode_jpeg(jpeg_quality))
+            mask = self._encoded_form(".alpha.png", self._encode_alpha)
+            return jpeg, mask
+        return self.png_bytes, None
+
+    def overlay_pdf(self, encoding="flate", jpeg_quality=DEFAULT_JPEG_QUALITY):
+        """A 1x1 pt PDF page whose only resource is the signature image XObject."""
+        if encoding == "jpeg":
+            return self._encoded_form(f".q{jpeg_quality}.pdf", lambda: self._encode_jpeg_overlay(jpeg_quality))
+        return self._encoded_form(".pdf", self._encode_overlay_pdf)
+
+    def resampled(self, target_size):
+        """
+        Returns a variant downsampled to the smallest size that still covers
+        target_size (width, height) in pixels on both axes, keeping the aspect
+        ratio. Returns self when the image is already small enough.
+        """
+        width = max(1, math.ceil(target_size[0]))
+        height = max(1, math.ceil(target_size[1]))
+        with self._lock:
+            variant = self._variants.get((width, height))
+        if variant is not None:
+            return variant
+
+        scale = max(width / self.image.width, height / self.image.height)
+        if scale >= 1:
+            variant = self
+        else:
+            size = (max(1, round(self.image.width * scale)), max(1, round(self.image.height * scale)))
+            key = f"{self.key}_{size[0]}x{size[1]}" if self.key else None
+            from PIL import Image
+            # reducing_gap does most of the reduction cheaply before the Lanczos pass
+            variant = SignatureAsset(key, self.image.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0), self.cache_dir)
+        with self._lock:
+            return self._variants.setdefault((width, height), variant)
+
+    def _encoded_form(self, suffix, build):
+        data = self._encoded.get(suffix)
+        if data is None:
+            data = self._load_or_build(suffix, build)
+            self._encoded[suffix] = data
+        return data
+
+    def _encode_png(self):
+        buffer = io.BytesIO()
+        self.image.save(buffer, format='PNG')
+        return buffer.getvalue()
+
+    def _encode_jpeg(self, quality):
+        from PIL import Image
+        # Flatten onto white so hidden pixels under the mask don't bleed dark fringes into the edges
+        background = Image.new("RGBA", self.image.size, (255, 255, 255, 255))
+        rgb = Image.alpha_composite(background, self.image).convert("RGB")
+        buffer = io.BytesIO()
+        rgb.save(buffer, format='JPEG', quality=quality, optimize=True)
+        return buffer.getvalue()
+
+    def _encode_alpha(self):
+        buffer = io.BytesIO()
+        self.image.getchannel("A").save(buffer, format='PNG', optimize=True)
+        return buffer.getvalue()
+
+    def _encode_overlay_pdf(self):
+        # ReportLab is only needed by the pypdf2 backend
+        from reportlab.pdfgen import canvas
+        from reportlab.lib.utils import ImageReader
+        buffer = io.BytesIO()
+        signature_canvas = canvas.Canvas(buffer, pagesize=(1, 1))
+        signature_canvas.drawImage(ImageReader(self.image), 0, 0, width=1, height=1, mask='auto')
+        signature_canvas.save()
+        return buffer.getvalue()
+
+    def _encode_jpeg_overlay(self, quality):
+        # ReportLab cannot pair a passed-through JPEG with a soft mask, fitz can
+        import fitz
+        stream, mask = self.image_streams("jpeg", quality)
+        doc = fitz.open()
+        try:
+            page = doc.new_page(width=1, height=1)
+            page.insert_image(page.rect, stream=stream, mask=mask, keep_proportion=False)
+            return doc.tobytes(deflate=True)
+        finally:
+            doc.close()
+
+    def _load_or_build(self, suffix, build):
+        path = os.path.join(self.cache_dir, self.key + suffix) if self.cache_dir and self.key else None
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                return f.read()
+        data = build()
+        if path:
+            # Write under a temporary name so a concurrent reader never sees a partial file
+            partial_path = f"{path}.{os.getpid()}.part"
+            with open(partial_path, "wb") as f:
+                f.write(data)
+            os.replace(partial_path, path)
+        return data
+
+class SignatureCache:
+    """
+    Least-recently-used cache of SignatureAssets keyed by the SHA-256 of the
+    image file's content and the target raster size, so the same signature
+    is decoded and encoded once no matter how many documents it is stamped
+    on or which path it is loaded from. With cache_dir, the encoded forms
+    are also persisted there and shared across processes and runs.
+    """
+
+    def __init__(self, cache_dir=None, max_entries=32):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._assets = OrderedDict()  # digest: SignatureAsset
+        self._digests = {}  # (path, mtime_ns, size): content digest
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, signature_path, target_size=None):
+        """
+        Returns the SignatureAsset for the image at signature_path.
+        target_size: optional (width, height) in pixels; larger images are
+            downsampled as described in SignatureAsset.resampled.
+        """
+        if not os.path.exists(signature_path):
+            raise ValueError(f"Signature image not found at: {signature_path}")
+
+        digest = self._digest(signature_path)
+        with self._lock:
+            asset = self._assets.get(digest)
+            if asset is not None:
+                self._assets.move_to_end(digest)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if asset is None:
+            persisted = self.cache_dir and os.path.exists(os.path.join(self.cache_dir, digest + ".png"))
+            if persisted:
+                # Decoded lazily from the persisted PNG, and only if a backend needs the pixels
+                asset = SignatureAsset(digest, cache_dir=self.cache_dir)
+            else:
+                from PIL import Image
+                asset = SignatureAsset(digest, Image.open(signature_path).convert("RGBA"), self.cache_dir)
+            with self._lock:
+                asset = self._assets.setdefault(digest, asset)
+                while len(self._assets) > self.max_entries:
+                    self._assets.popitem(last=False)
+
+        return asset if target_size is None else asset.resampled(target_size)
+
+    def clear(self):
+        with self._lock:
+            self._assets.clear()
+            self._digests.clear()
+
+    def stats(self):
+        """Returns counters for diagnostics."""
+        with self._lock:
+            return {'entries': len(self._assets), 'hits': self.hits, 'misses': self.misses}
+
+    def _digest(self, signature_path):
+        # Rehash only when the file changed, so repeated lookups skip reading it
+        stat = os.stat(signature_path)
+        stat_key = (os.path.abspath(signature_path), stat.st_mtime_ns, stat.st_size)
+        digest = self._digests.get(stat_key)
+        if digest is None:
+            with open(signature_path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            self._digests[stat_key] = digest
+        return digest
@@ -0,0 +1,78 @@
+import threading
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from pdf_processor import ProcessingCancelled
+
+SAVING_NOTICE_TIMEOUT = 1.0  # seconds the worker waits for the GUI to show the saving phase
+
+class SigningWorker(QThread):
+    """
+    Runs PDFProcessor.add_signatures_to_pdf off the GUI thread, reporting
+    per-page progress and stopping at the next page once cancel() is called.
+    Signing the PDF the processor has loaded goes through sign_loaded_pdf,
+    which signs from the loaded mapping with PyMuPDF instead of parsing the
+    whole file again with PyPDF2.
+
+    Once every page is stamped, the output is written in one call that cannot
+    be cancelled and that holds the GIL, so the GUI cannot repaint until it
+    returns (about a second per 1,000 pages). saving is emitted first, and the
+    worker waits until the GUI calls saving_shown(), or SAVING_NOTICE_TIMEOUT.
+    """
+    progress = pyqtSignal(int, int)  # pages done, total
+    saving = pyqtSignal()  # every page is done; the output is being written and can no longer be cancelled
+    succeeded = pyqtSignal(str)  # output_pdf_path
+    failed = pyqtSignal(str)  # error message
+    cancelled = pyqtSignal()
+
+    def __init__(self, pdf_processor, input_pdf_path, signature_path, output_pdf_path, signature_data, parent=None):
+        super().__init__(parent)
+        self.pdf_processor = pdf_processor
+        self.input_pdf_path = input_pdf_path
+        self.signature_path = signature_path
+        self.output_pdf_path = output_pdf_path
+        self.signature_data = signature_data
+        self._cancel_event = threading.Event()
+        self._saving_shown = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+        # Nobody may be left to acknowledge the saving phase, e.g. when the window is closing
+        self._saving_shown.set()
+
+    def saving_shown(self):
+        """Lets the write start once the GUI shows the saving phase."""
+        self._saving_shown.set()
+
+    def _on_progress(self, done, total):
+        if self._cancel_event.is_set():
+            raise ProcessingCancelled()
+        self.progress.emit(done, total)
+        if done == total:
+            self.saving.emit()
+            self._saving_shown.wait(SAVING_NOTICE_TIMEOUT)
+
+    def run(self):
+        try:
+            if self.pdf_processor.is_loaded(self.input_pdf_path):
+                self.pdf_processor.sign_loaded_pdf(
+                    self.signature_path,
+                    self.output_pdf_path,
+                    self.signature_data,
+                    progress_callback=self._on_progress
+                )
+            else:
+                self.pdf_processor.add_signatures_to_pdf(
+                    self.input_pdf_path,
+                    self.signature_path,
+                    self.output_pdf_path,
+                    self.signature_data,
+                    progress_callback=self._on_progress
+                )
+        except ProcessingCancelled:
+            self.cancelled.emit()
+            return
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        # A cancel that arrived during the final write is too late to honour; report the file
+        self.succeeded.emit(self.output_pdf_path)
@@ -0,0 +1,145 @@
+from array import array
+from PyPDF2.generic import (
+    ArrayObject, DictionaryObject, IndirectObject, NameObject, NumberObject, StreamObject
+)
+
+class StreamingPdfWriter:
+    """
+    Writes a PDF page by page instead of holding the whole document like
+    PyPDF2's PdfWriter. add_page serializes the page together with every
+    object it references that has not been written yet, so only one page's
+    objects are in memory at a time. Objects shared between pages (fonts,
+    the signature image) are written once and referenced afterwards.
+
+    The reader should be opened on a file object rather than a path, since
+    PdfReader(path) loads the whole file into memory.
+    """
+
+    CATALOG_NUMBER = 1
+    PAGES_NUMBER = 2
+
+    def __init__(self, output_stream, reader):
+        if reader.is_encrypted:
+            raise ValueError("Streaming output does not support encrypted PDFs.")
+        self.stream = output_stream
+        self.reader = reader
+        self._offsets = array('q')  # byte offset per object number, 0 = not written
+        self._pending = []  # (output number, object) waiting to be written
+        # Source idnum -> output number; keyed (id(pdf), idnum) for objects of other readers
+        self._translated = {}
+        self._page_numbers = []
+
+        # Pages get fixed numbers up front so links between pages resolve
+        # without pulling the target page (and its /Parent tree) in early
+        self._page_count = len(reader.pages)
+        for index, page in enumerate(reader.pages):
+            self._translated[page.indirect_reference.idnum] = self.PAGES_NUMBER + 1 + index
+        pages_ref = reader.trailer['/Root'].raw_get('/Pages')
+        if isinstance(pages_ref, IndirectObject):
+            self._translated[pages_ref.idnum] = self.PAGES_NUMBER
+        self._next_number = self.PAGES_NUMBER + 1 + self._page_count
+
+        header = reader.pdf_header
+        if isinstance(header, str):
+            header = header.encode()
+        self.stream.write(header + b"\n%\xe2\xe3\xcf\xd3\n")
+
+    def _add_object(self, obj):
+        """Queues a new object to be written with the next page; returns its reference."""
+        number = self._reserve_number()
+        self._pending.append((number, obj))
+        return IndirectObject(number, 0, self)
+
+    def import_object(self, ref):
+        """Returns a reference in this writer for an indirect object of any PdfReader."""
+        return self._translate(ref)
+
+    def add_page(self, page):
+        """Writes a page of the reader (in reader order) and everything it references."""
+        index = len(self._page_numbers)
+        if index >= self._page_count:
+            raise ValueError("More pages added than the reader contains.")
+        number = self.PAGES_NUMBER + 1 + index
+
+        page_copy = DictionaryObject()
+        for key, value in page.items():
+            if key in ('/Parent', '/StructParents'):
+                continue
+            page_copy[NameObject(key)] = self._translate(value)
+        page_copy[NameObject('/Parent')] = IndirectObject(self.PAGES_NUMBER, 0, self)
+        self._write_object(number, page_copy)
+        self._page_numbers.append(number)
+
+        while self._pending:
+            pending_number, obj = self._pending.pop(0)
+            self._write_object(pending_number, self._translate(obj))
+
+        # Drop everything the reader parsed for this page; shared objects are already written
+        self.reader.resolved_objects.clear()
+
+    def close(self):
+        """Writes the page tree, catalog, cross-reference table and trailer."""
+        if len(self._page_numbers) != self._page_count:
+            raise ValueError(f"Only {len(self._page_numbers)} of {self._page_count} pages were added.")
+
+        pages = DictionaryObject()
+        pages[NameObject('/Type')] = NameObject('/Pages')
+        pages[NameObject('/Kids')] = ArrayObject([IndirectObject(n, 0, self) for n in self._page_numbers])
+        pages[NameObject('/Count')] = NumberObject(self._page_count)
+        self._write_object(self.PAGES_NUMBER, pages)
+
+        catalog = DictionaryObject()
+        catalog[NameObject('/Type')] = NameObject('/Catalog')
+        catalog[NameObject('/Pages')] = IndirectObject(self.PAGES_NUMBER, 0, self)
+        self._write_object(self.CATALOG_NUMBER, catalog)
+
+        xref_offset = self.stream.tell()
+        size = self._next_number
+        self.stream.write(f"xref\n0 {size}\n".encode())
+        self.stream.write(b"0000000000 65535 f \n")
+        for number in range(1, size):
+            if number < len(self._offsets) and self._offsets[number]:
+                self.stream.write(f"{self._offsets[number]:010d} 00000 n \n".encode())
+            else:
+                self.stream.write(b"0000000000 00000 f \n")
+        self.stream.write(f"trailer\n<< /Size {size} /Root {self.CATALOG_NUMBER} 0 R >>\n".encode())
+        self.stream.write(f"startxref\n{xref_offset}\n%%EOF\n".encode())
+
+    def _reserve_number(self):
+        number = self._next_number
+        self._next_number += 1
+        return number
+
+    def _write_object(self, number, obj):
+        if number >= len(self._offsets):
+            self._offsets.extend([0] * (number + 1 - len(self._offsets)))
+        self._offsets[number] = self.stream.tell()
+        self.stream.write(f"{number} 0 obj\n".encode())
+        obj.write_to_stream(self.stream, None)
+        self.stream.write(b"\nendobj\n")
+
+    def _translate(self, obj):
+        """Copies obj with every indirect reference renumbered for this writer,
+        queueing referenced objects that have not been written yet."""
+        if isinstance(obj, IndirectObject):
+            if obj.pdf is self:
+                return obj
+            key = obj.idnum if obj.pdf is self.reader else (id(obj.pdf), obj.idnum)
+            if key not in self._translated:
+                self._translated[key] = self._reserve_number()
+                self._pending.append((self._translated[key], obj.get_object()))
+            return IndirectObject(self._translated[key], 0, self)
+        if isinstance(obj, StreamObject):
+            copy = obj.__class__()
+            copy._data = obj._data
+            for key, value in obj.items():
+                copy[NameObject(key)] = self._translate(value)
+            return copy
+        if isinstance(obj, DictionaryObject):
+            copy = DictionaryObject()
+            for key, value in obj.items():
+                copy[NameObject(key)] = self._translate(value)
+            return copy
+        if isinstance(obj, ArrayObject):
+            return ArrayObject([self._translate(value) for value in obj])
+        return obj
@@ -0,0 +1,123 @@
+"""
+Placement templates: reusable signature layouts for recurring form types.
+
+A template is a JSON file like
+    {
+        "name": "Purchase agreement",
+        "placements": [
+            {"pages": "last", "x": 0.12, "y": 0.08, "width": 0.25, "height": 0.06},
+            {"pages": "every", "x": 0.85, "y": 0.03, "width": 0.1, "height": 0.03}
+        ],
+        "anchors": [{"patterns": ["Signature:"], "width": 150, "height": 60}]
+    }
+Placement coordinates are fractions of the page width and height, measured
+from the bottom-left corner, so one template fits every page size. "pages" is
+"first", "last", "every", or a 0-indexed range string such as "0,2-4".
+The optional "anchors" are placement.find_anchor_placements specs in points.
+Applying a template only reads page sizes (and page text for anchors), it
+never renders a page.
+"""
+
+import os
+import json
+
+from placement import TextIndex, find_anchor_placements
+from utils import parse_page_ranges, normalize_anchor_spec
+
+PAGE_SELECTORS = ("first", "last", "every")
+
+def load_template(template_path):
+    """Reads and validates a template file."""
+    if not os.path.exists(template_path):
+        raise ValueError(f"Template not found at: {template_path}")
+    try:
+        with open(template_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Template {template_path} is not valid JSON: {e}")
+    return normalize_template(data)
+
+def save_template(template_path, template):
+    template = normalize_template(template)
+    with open(template_path, 'w', encoding='utf-8') as f:
+        json.dump(template, f, indent=2)
+
+def normalize_template(data):
+    if not isinstance(data, dict):
+        raise ValueError("A template must be a JSON object.")
+    template = {'name': str(data.get('name', '')), 'placements': [], 'anchors': []}
+    for placement in data.get('placements', []):
+        try:
+            normalized = {'pages': str(placement.get('pages', 'every')).strip().lower()}
+            for field in ('x', 'y', 'width', 'height'):
+                normalized[field] = float(placement[field])
+        except (AttributeError, KeyError, TypeError, ValueError):
+            raise ValueError(f"Template has an invalid placement: {placement}")
+        if normalized['pages'] not in PAGE_SELECTORS:
+            parse_page_ranges(normalized['pages'])
+        template['placements'].append(normalized)
+    template['anchors'] = [normalize_anchor_spec(spec, "Template") for spec in data.get('anchors', [])]
+    if not template['placements'] and not template['anchors']:
+        raise ValueError("Template has no placements or anchors.")
+    return template
+
+def select_pages(selector, page_count):
+    """0-indexed pages of a page_count page document that a placement's "pages" selects."""
+    if selector == "every":
+        return list(range(page_count))
+    if selector == "first":
+        return [0] if page_count else []
+    if selector == "last":
+        return [page_count - 1] if page_count else []
+    return [p for p in parse_page_ranges(selector) if p < page_count]
+
+def template_placements(doc, template, text_index=None):
+    """Returns signature_data for an open fitz document laid out by template."""
+    import fitz
+    signature_data = []
+    for placement in template['placements']:
+        for page_num in select_pages(placement['pages'], len(doc)):
+            page = doc[page_num]
+            page_width, page_height = page.rect.width, page.rect.height
+            width = placement['width'] * page_width
+            height = placement['height'] * page_height
+            left = placement['x'] * page_width
+            top = page_height - placement['y'] * page_height - height
+            pdf_box = fitz.Rect(left, top, left + width, top + height) * ~page.transformation_matrix
+            signature_data.append({'page_num': page_num, 'x': pdf_box.x0, 'y': pdf_box.y0, 'width': width, 'height': height})
+
+    if template['anchors']:
+        text_index = text_index or TextIndex(doc)
+        for spec in template['anchors']:
+            signature_data.extend(find_anchor_placements(doc, text_index=text_index, **spec))
+    return signature_data
+
+def placements_for_template(pdf_path, template):
+    """Opens pdf_path and returns its signature_data for template (a dict or a template file path)."""
+    import fitz
+    if isinstance(template, str):
+        template = load_template(template)
+    with fitz.open(pdf_path) as doc:
+        return template_placements(doc, template)
+
+def template_from_positions(doc, positions, name=""):
+    """
+    Builds a template from placements keyed by page number, as the GUI's
+    saved_positions holds them. A position on the last page is stored as
+    "last" so the template follows documents of other lengths.
+    """
+    import fitz
+    placements = []
+    for page_num in sorted(positions):
+        position = positions[page_num]
+        page = doc[page_num]
+        page_width, page_height = page.rect.width, page.rect.height
+        page_box = fitz.Rect(position['x'], position['y'], position['x'] + position['width'], position['y'] + position['height']) * page.transformation_matrix
+        placements.append({
+            'pages': "last" if page_num == len(doc) - 1 else str(page_num),
+            'x': page_box.x0 / page_width,
+            'y': (page_height - page_box.y1) / page_height,
+            'width': position['width'] / page_width,
+            'height': position['height'] / page_height,
+        })
+    return normalize_template({'name': name, 'placements': placements})
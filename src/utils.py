@@ -1,3 +1,9 @@
+import os
+import csv
+import json
+
+from placement import ANCHOR_POSITIONS
+
 def parse_page_ranges(page_string):
     """Parse page string like '1,3,5-7' into list of page numbers (0-indexed)"""
     pages = []
@@ -32,4 +38,113 @@ def canvas_to_pdf_size(canvas_width, canvas_height, canvas_scale):
     dpi_scale = 72.0 / 150.0
     pdf_width = pdf_image_width * dpi_scale
     pdf_height = pdf_image_height * dpi_scale
-    return pdf_width, pdf_height
\ No newline at end of file
+    return pdf_width, pdf_height
+
+MANIFEST_PLACEMENT_FIELDS = ('page_num', 'x', 'y', 'width', 'height')
+
+def load_manifest(manifest_path):
+    """
+    Loads a batch manifest into a list of job dicts with keys
+    'input_pdf_path', 'signature_path', 'output_pdf_path' and 'signature_data'
+    (the same placement dicts add_signatures_to_pdf accepts).
+
+    JSON manifests hold a list of such jobs (or {"jobs": [...]}). Instead of, or
+    in addition to, 'signature_data' a JSON job may give 'anchors': a list of
+    anchor specs whose matches are turned into placements when the job runs,
+    e.g. {"patterns": ["Signature:"], "width": 150, "height": 60,
+    "position": "right", "offset": [0, 0], "pages": "0-2"}. A top-level
+    "anchors" in {"jobs": [...]} applies to every job without its own.
+    Likewise 'template' names a placement template file (see templates.py).
+    CSV manifests hold one placement per row with the columns
+    input_pdf_path, signature_path, output_pdf_path, page_num, x, y, width, height;
+    consecutive rows for the same input/signature/output form one job.
+    Relative paths are resolved against the manifest's folder.
+    """
+    if not os.path.exists(manifest_path):
+        raise ValueError(f"Manifest not found at: {manifest_path}")
+
+    default_anchors = None
+    default_template = None
+    if manifest_path.lower().endswith('.csv'):
+        jobs = _load_csv_manifest(manifest_path)
+    else:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        jobs = data.get('jobs', []) if isinstance(data, dict) else data
+        if isinstance(data, dict):
+            default_anchors = data.get('anchors')
+            default_template = data.get('template')
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    for index, job in enumerate(jobs):
+        if 'anchors' not in job and default_anchors is not None:
+            job['anchors'] = default_anchors
+        if 'template' not in job and default_template is not None:
+            job['template'] = default_template
+        has_placements = job.get('anchors') or job.get('template')
+        required = ('input_pdf_path', 'signature_path', 'output_pdf_path') + (() if has_placements else ('signature_data',))
+        missing = [key for key in required if key not in job]
+        if missing:
+            raise ValueError(f"Manifest job {index} is missing: {', '.join(missing)}")
+        for key in ('input_pdf_path', 'signature_path', 'output_pdf_path'):
+            job[key] = os.path.join(base_dir, job[key])
+        job['signature_data'] = [normalize_placement(sig, f"Manifest job {index}") for sig in job.get('signature_data', [])]
+        anchors = job.get('anchors') or []
+        job['anchors'] = [normalize_anchor_spec(spec, f"Manifest job {index}") for spec in (anchors if isinstance(anchors, list) else [anchors])]
+        if job.get('template'):
+            job['template'] = os.path.join(base_dir, job['template'])
+    return jobs
+
+def _load_csv_manifest(manifest_path):
+    jobs = []
+    with open(manifest_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            key = (row.get('input_pdf_path'), row.get('signature_path'), row.get('output_pdf_path'))
+            if not jobs or jobs[-1]['_key'] != key:
+                jobs.append({
+                    '_key': key,
+                    'input_pdf_path': key[0],
+                    'signature_path': key[1],
+                    'output_pdf_path': key[2],
+                    'signature_data': [],
+                })
+            jobs[-1]['signature_data'].append({field: row.get(field) for field in MANIFEST_PLACEMENT_FIELDS})
+    for job in jobs:
+        del job['_key']
+    return jobs
+
+def normalize_placement(sig, context):
+    """Validates a signature_data entry, converting its fields to numbers;
+    context names its source in error messages (e.g. "Manifest job 3")."""
+    try:
+        placement = dict(sig)
+        placement['page_num'] = int(sig['page_num'])
+        for field in ('x', 'y', 'width', 'height'):
+            placement[field] = float(sig[field])
+        return placement
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"{context} has an invalid placement: {sig}")
+
+def normalize_anchor_spec(spec, context):
+    """Validates an anchor spec into find_anchor_placements keyword arguments;
+    context names its source in error messages (e.g. "Manifest job 3")."""
+    try:
+        normalized = {'width': float(spec['width']), 'height': float(spec['height'])}
+        if 'patterns' in spec:
+            patterns = spec['patterns']
+            normalized['patterns'] = [patterns] if isinstance(patterns, str) else [str(p) for p in patterns]
+        if 'position' in spec:
+            if spec['position'] not in ANCHOR_POSITIONS:
+                raise ValueError()
+            normalized['position'] = spec['position']
+        if 'offset' in spec:
+            dx, dy = spec['offset']
+            normalized['offset'] = (float(dx), float(dy))
+        if 'pages' in spec:
+            pages = spec['pages']
+            normalized['pages'] = parse_page_ranges(pages) if isinstance(pages, str) else [int(p) for p in pages]
+        if 'ignore_case' in spec:
+            normalized['ignore_case'] = bool(spec['ignore_case'])
+        return normalized
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"{context} has an invalid anchor spec: {spec}")